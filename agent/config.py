@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import os
 import uuid
 from dataclasses import dataclass, field
@@ -11,10 +12,128 @@ from typing import Optional
 import yaml
 from dotenv import load_dotenv
 
+try:
+    from yaml import CSafeLoader as _YamlSafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlSafeLoader
+
 load_dotenv()
 
 DEFAULT_SKILLS_DIR = "./.claude/skills"
 
+# Relative skills paths are resolved against the repo root, not the CWD.
+_PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+# SKILL.md frontmatter is a few hundred bytes; stop scanning for the closing
+# delimiter after this much so a malformed file is not read end to end.
+_MAX_FRONTMATTER_CHARS = 4096
+
+_VALID_OUTPUT_MODES = frozenset({"auto", "uc_volume", "local"})
+
+# Databricks runtime sets DATABRICKS_RUNTIME_VERSION
+# Model Serving/Apps set additional env vars depending on execution environment.
+_DATABRICKS_ENV_FLAGS = frozenset(
+    {"DATABRICKS_RUNTIME_VERSION", "IS_SERVERLESS", "DATABRICKS_APP_NAME", "DATABRICKS_APP_ID"}
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _detect_databricks() -> bool:
+    """Check the Databricks runtime env vars once; they are fixed for the process."""
+    return not _DATABRICKS_ENV_FLAGS.isdisjoint(os.environ)
+
+
+def _skill_dir_mtimes(skill_dirs: tuple[Path, ...]) -> tuple[int | None, ...]:
+    """st_mtime_ns of each skill directory (None if missing).
+
+    A directory's mtime changes whenever a skill subdirectory is added,
+    removed or renamed, so it keys the discovery caches below.
+    """
+    mtimes: list[int | None] = []
+    for skills_dir in skill_dirs:
+        try:
+            mtimes.append(skills_dir.stat().st_mtime_ns)
+        except FileNotFoundError:
+            mtimes.append(None)
+    return tuple(mtimes)
+
+
+@functools.lru_cache(maxsize=8)
+def _discover_skills(
+    skill_dirs: tuple[Path, ...], dir_mtimes: tuple[int | None, ...]
+) -> tuple[str, ...]:
+    """Scan skill directories for subdirectories containing a SKILL.md.
+
+    Uses os.scandir so the directory check comes from the cached entry type
+    instead of a separate stat per entry. ``dir_mtimes`` (from
+    _skill_dir_mtimes) keys the cache, so adding or removing a skill is
+    picked up on the next lookup.
+    """
+    skills: list[str] = []
+    seen: set[str] = set()
+    for skills_dir in skill_dirs:
+        try:
+            with os.scandir(skills_dir) as it:
+                names = sorted(
+                    entry.name
+                    for entry in it
+                    if entry.is_dir() and os.path.exists(os.path.join(entry.path, "SKILL.md"))
+                )
+        except FileNotFoundError:
+            continue
+        for name in names:
+            if name in seen:
+                continue
+            seen.add(name)
+            skills.append(name)
+    return tuple(skills)
+
+
+@functools.lru_cache(maxsize=64)
+def _resolve_skill_dir(
+    skill_dirs: tuple[Path, ...], dir_mtimes: tuple[int | None, ...], skill_name: str
+) -> Path | None:
+    """Return the first skill directory containing ``skill_name/SKILL.md``.
+
+    ``dir_mtimes`` keys the cache like _discover_skills, so a miss is retried
+    once a skill is added.
+    """
+    for skills_dir in skill_dirs:
+        candidate = skills_dir / skill_name
+        if (candidate / "SKILL.md").exists():
+            return candidate
+    return None
+
+
+@functools.lru_cache(maxsize=64)
+def _parse_skill_frontmatter(skill_md_path: str, mtime_ns: int) -> dict:
+    """Parse SKILL.md YAML frontmatter; ``mtime_ns`` keys the cache so edits are picked up.
+
+    Reads line by line and stops at the closing ``---`` so the Markdown body
+    is never loaded; gives up after _MAX_FRONTMATTER_CHARS without a delimiter.
+    """
+    with open(skill_md_path, encoding="utf-8") as f:
+        if not f.readline().startswith("---"):
+            return {}
+        lines: list[str] = []
+        size = 0
+        for line in f:
+            if line.startswith("---"):
+                break
+            size += len(line)
+            if size > _MAX_FRONTMATTER_CHARS:
+                return {}
+            lines.append(line)
+        else:
+            return {}
+
+    # Parse YAML frontmatter using pyyaml for robust parsing
+    try:
+        metadata = yaml.load("".join(lines), Loader=_YamlSafeLoader)
+        return metadata if isinstance(metadata, dict) else {}
+    except yaml.YAMLError:
+        return {}
+
 
 @dataclass
 class AgentConfig:
@@ -25,11 +144,6 @@ class AgentConfig:
     local_output_dir: str = "./output"
     output_mode: str = "auto"  # auto | uc_volume | local
     skills_directory: Path = field(default_factory=lambda: Path(DEFAULT_SKILLS_DIR))
-    def __setattr__(self, name: str, value):
-        """Convert skills_directory to Path if string is passed."""
-        if name == "skills_directory" and isinstance(value, str):
-            value = Path(value)
-        super().__setattr__(name, value)
 
     # Max agent iterations
     max_iterations: int = 10
@@ -43,7 +157,7 @@ class AgentConfig:
 
     @staticmethod
     def _env_int(name: str, default: int) -> int:
-        value = os.getenv(name)
+        value = os.environ.get(name)
         if value is None:
             return default
         try:
@@ -69,29 +183,30 @@ class AgentConfig:
 
         Supports both AGENT_* variables and legacy names used by app.yaml.
         """
+        env = os.environ
         return cls(
-            databricks_profile=os.getenv("DATABRICKS_CONFIG_PROFILE", ""),
-            model_endpoint=os.getenv(
+            databricks_profile=env.get("DATABRICKS_CONFIG_PROFILE", ""),
+            model_endpoint=env.get(
                 "AGENT_MODEL_ENDPOINT",
-                os.getenv("SERVING_ENDPOINT_NAME", "databricks-gpt-5-2"),
+                env.get("SERVING_ENDPOINT_NAME", "databricks-gpt-5-2"),
             ),
             uc_volume_path=cls._normalize_uc_volume_path(
-                os.getenv(
+                env.get(
                     "AGENT_UC_VOLUME_PATH",
-                    os.getenv(
+                    env.get(
                         "UC_VOLUME_PATH", "/Volumes/hls_amer_catalog/appeals-review/created_docs"
                     ),
                 )
             ),
-            local_output_dir=os.getenv("AGENT_LOCAL_OUTPUT_DIR", "./output"),
-            output_mode=os.getenv("AGENT_OUTPUT_MODE", "auto").strip().lower(),
-            skills_directory=os.getenv(
+            local_output_dir=env.get("AGENT_LOCAL_OUTPUT_DIR", "./output"),
+            output_mode=env.get("AGENT_OUTPUT_MODE", "auto").strip().lower(),
+            skills_directory=env.get(
                 "AGENT_SKILLS_DIR",
-                os.getenv("SKILLS_DIR", DEFAULT_SKILLS_DIR),
+                env.get("SKILLS_DIR", DEFAULT_SKILLS_DIR),
             ),
             max_iterations=cls._env_int("AGENT_MAX_ITERATIONS", 10),
             llm_timeout=cls._env_int("AGENT_LLM_TIMEOUT", 120),
-            session_id=os.getenv("AGENT_SESSION_ID"),
+            session_id=env.get("AGENT_SESSION_ID"),
         )
 
     def __post_init__(self):
@@ -99,29 +214,26 @@ class AgentConfig:
         if self.max_iterations < 1:
             self.max_iterations = 1
 
-        if self.output_mode not in {"auto", "uc_volume", "local"}:
+        if self.output_mode not in _VALID_OUTPUT_MODES:
             self.output_mode = "auto"
 
+        # Accept a plain string (e.g. from env vars) and normalize to Path.
+        if isinstance(self.skills_directory, str):
+            self.skills_directory = Path(self.skills_directory)
+
         # Resolve relative skills path against project root so discovery is not CWD-dependent.
+        # Copies made with dataclasses.replace already hold the absolute path and skip this.
         if not self.skills_directory.is_absolute():
-            project_root = Path(__file__).resolve().parents[1]
-            self.skills_directory = (project_root / self.skills_directory).resolve()
+            self.skills_directory = (_PROJECT_ROOT / self.skills_directory).resolve()
 
         # Generate session ID if not provided
         if self.session_id is None:
-            self.session_id = str(uuid.uuid4())[:8]
+            self.session_id = uuid.uuid4().hex[:8]
 
     @property
     def is_running_in_databricks(self) -> bool:
         """Check if we're running inside Databricks runtime."""
-        # Databricks runtime sets DATABRICKS_RUNTIME_VERSION
-        # Model Serving/Apps set additional env vars depending on execution environment.
-        return (
-            "DATABRICKS_RUNTIME_VERSION" in os.environ
-            or "IS_SERVERLESS" in os.environ
-            or "DATABRICKS_APP_NAME" in os.environ
-            or "DATABRICKS_APP_ID" in os.environ
-        )
+        return _detect_databricks()
 
     @property
     def session_output_path(self) -> str:
@@ -142,47 +254,33 @@ class AgentConfig:
         """Return configured skill directory."""
         return [self.skills_directory]
 
+    def skill_directory_mtimes(self) -> tuple[int | None, ...]:
+        """Modification times of the skill directories (None for a missing one)."""
+        return _skill_dir_mtimes(tuple(self.skill_directories))
+
     @property
     def available_skills(self) -> list[str]:
         """List available skills discovered across configured skill directories."""
-        skills: list[str] = []
-        seen: set[str] = set()
-        for skills_dir in self.skill_directories:
-            if not skills_dir.exists():
-                continue
-            for entry in sorted(skills_dir.iterdir()):
-                if not entry.is_dir() or not (entry / "SKILL.md").exists():
-                    continue
-                if entry.name in seen:
-                    continue
-                seen.add(entry.name)
-                skills.append(entry.name)
-        return skills
+        skill_dirs = tuple(self.skill_directories)
+        return list(_discover_skills(skill_dirs, _skill_dir_mtimes(skill_dirs)))
 
     def get_skill_path(self, skill_name: str) -> Path:
         """Get the path to a specific skill from known skill directories."""
-        for skills_dir in self.skill_directories:
-            candidate = skills_dir / skill_name
-            if (candidate / "SKILL.md").exists():
-                return candidate
+        skill_dirs = tuple(self.skill_directories)
+        skill_dir = _resolve_skill_dir(skill_dirs, _skill_dir_mtimes(skill_dirs), skill_name)
+        if skill_dir is not None:
+            return skill_dir
         return self.skills_directory / skill_name
 
     def load_skill_metadata(self, skill_name: str) -> dict:
-        """Load skill metadata from SKILL.md frontmatter."""
+        """Load skill metadata from SKILL.md frontmatter.
+
+        Parsed metadata is cached by path and modification time, so repeated
+        lookups cost a single stat until the file changes.
+        """
         skill_path = self.get_skill_path(skill_name) / "SKILL.md"
-        if not skill_path.exists():
+        try:
+            mtime_ns = skill_path.stat().st_mtime_ns
+        except FileNotFoundError:
             return {}
-
-        content = skill_path.read_text()
-
-        # Parse YAML frontmatter using pyyaml for robust parsing
-        if content.startswith("---"):
-            end_idx = content.find("---", 3)
-            if end_idx != -1:
-                frontmatter = content[3:end_idx].strip()
-                try:
-                    metadata = yaml.safe_load(frontmatter)
-                    return metadata if isinstance(metadata, dict) else {}
-                except yaml.YAMLError:
-                    return {}
-        return {}
+        return dict(_parse_skill_frontmatter(str(skill_path), mtime_ns))
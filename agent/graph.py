@@ -2,15 +2,23 @@
 
 from __future__ import annotations
 
+import asyncio
 import dataclasses
+import functools
+import gc
 import logging
 import operator
-from collections.abc import AsyncGenerator, Generator
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import AsyncGenerator, Generator, Iterator
+from contextlib import contextmanager
 from typing import Annotated, Any, Literal, TypedDict
 
-import mlflow
-from langchain_core.messages import AIMessage, BaseMessage, SystemMessage, ToolMessage
-from langchain_core.runnables import RunnableConfig
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, SystemMessage, ToolMessage
+from langchain_core.messages.ai import add_ai_message_chunks
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import END, StateGraph
 from langgraph.graph.message import add_messages
@@ -18,10 +26,75 @@ from databricks.sdk import WorkspaceClient
 from databricks_langchain import ChatDatabricks
 
 from .config import AgentConfig
-from .tools import AGENT_TOOLS, ToolContext, build_skill_context, handle_tool_call  # ToolContext used via from_dict/to_dict
+from .tools import (  # ToolContext used via from_dict/to_dict
+    AGENT_TOOLS,
+    CONTEXT_FREE_TOOLS,
+    ToolContext,
+    build_skill_context,
+    get_workspace_client,
+    group_tool_calls,
+    run_in_groups,
+    traced_tool_call,
+)
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on per-session config copies kept by DocumentAgent.
+_MAX_SESSION_CONFIGS = 256
+
+# Upper bound on tool calls from one LLM response executed concurrently.
+_MAX_TOOL_WORKERS = 8
+
+# Persist the checkpoint once per run rather than after every step. The saver is
+# in-memory, so intermediate checkpoints only matter for resuming a crashed run,
+# which a MemorySaver cannot do anyway.
+_CHECKPOINT_DURABILITY = "exit"
+
+
+_gc_pause_lock = threading.Lock()
+_gc_pause_depth = 0
+_gc_was_enabled = True
+
+
+@contextmanager
+def _no_gc() -> Iterator[None]:
+    """Pause the cyclic GC while the block runs.
+
+    Checkpoint (de)serialization allocates many short-lived objects that never
+    form cycles but still trigger collections. gc.disable() is process-wide,
+    so nested and concurrent users are counted and GC comes back on only when
+    the last one exits (and only if it was on to begin with).
+    """
+    global _gc_pause_depth, _gc_was_enabled
+    with _gc_pause_lock:
+        if _gc_pause_depth == 0:
+            _gc_was_enabled = gc.isenabled()
+            gc.disable()
+        _gc_pause_depth += 1
+    try:
+        yield
+    finally:
+        with _gc_pause_lock:
+            _gc_pause_depth -= 1
+            if _gc_pause_depth == 0 and _gc_was_enabled:
+                gc.enable()
+
+
+class _GCPausedMemorySaver(MemorySaver):
+    """MemorySaver that pauses GC while encoding and decoding checkpoints."""
+
+    def get_tuple(self, config):
+        with _no_gc():
+            return super().get_tuple(config)
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        with _no_gc():
+            return super().put(config, checkpoint, metadata, new_versions)
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        with _no_gc():
+            return super().put_writes(config, writes, task_id, task_path)
+
 
 class AgentState(TypedDict):
     """State for the agent workflow."""
@@ -33,35 +106,39 @@ class AgentState(TypedDict):
     output_tokens: Annotated[int, operator.add]
 
 
-class DocumentAgent:
-    """LangGraph-based document agent with tool-calling workflow."""
+def _merge_chunks(chunks: list[AIMessageChunk]) -> AIMessageChunk:
+    """Fold streamed chunks into one message in a single pass.
 
-    def __init__(self, config: AgentConfig | None = None):
-        self.config = config or AgentConfig.from_env()
-        self.llm = ChatDatabricks(
-            endpoint=self.config.model_endpoint,
-            workspace_client=self._create_workspace_client(),
-            temperature=0.1,
-            request_timeout=self.config.llm_timeout,
-        )
-        self.skill_context = build_skill_context(self.config)
-        self._checkpointer = MemorySaver()
-        self._compiled_graph = None
-        self._async_compiled_graph = None
+    Adding chunks pairwise re-copies the accumulated content on every token;
+    add_ai_message_chunks merges the whole list at once.
+    """
+    if len(chunks) == 1:
+        return chunks[0]
+    return add_ai_message_chunks(chunks[0], *chunks[1:])
 
-    def _create_workspace_client(self) -> WorkspaceClient:
-        """Create workspace client using runtime identity or local profile."""
-        if self.config.is_running_in_databricks:
-            return WorkspaceClient()
-        if self.config.databricks_profile:
-            return WorkspaceClient(profile=self.config.databricks_profile)
-        return WorkspaceClient()
 
-    def _build_system_prompt(self, session_output_path: str) -> str:
-        """Build the system prompt with skill and storage context."""
-        return f"""You are a helpful AI assistant with access to specialized skills and Unity Catalog storage.
+def _agent_update(
+    state_session_id: str | None,
+    session_id: str,
+    iteration_count: int,
+    response: BaseMessage,
+    usage: dict[str, Any],
+) -> dict[str, Any]:
+    """Partial state update for an agent step; session_id only when it was filled in."""
+    update = {
+        "messages": [response],
+        "iteration_count": iteration_count,
+        "input_tokens": usage.get("input_tokens", 0),
+        "output_tokens": usage.get("output_tokens", 0),
+    }
+    if state_session_id != session_id:
+        update["session_id"] = session_id
+    return update
+
 
-{self.skill_context}
+_SYSTEM_PROMPT_TEMPLATE = """You are a helpful AI assistant with access to specialized skills and Unity Catalog storage.
+
+{skill_context}
 
 ## How to Use Skills
 
@@ -75,14 +152,19 @@ If a skill was already loaded earlier in this conversation, you do not need to l
 
 ## Storage
 
-You have full read access to the Unity Catalog Volume at: {self.config.uc_volume_path}
+You have full read access to the Unity Catalog Volume at: {uc_volume_path}
 
 - **To find files**: use `list_volume_files` starting from the volume root or any subdirectory. Browse freely — you are not limited to the session folder.
-- **To read files**: use `read_from_volume` with the full absolute path (e.g. `{self.config.uc_volume_path}/some/folder/file.pdf`).
+- **To read files**: use `read_from_volume` with the full absolute path (e.g. `{uc_volume_path}/some/folder/file.pdf`).
+- **To read several files**: prefer one `read_many_from_volume` call over repeated `read_from_volume` calls when you need two or more files.
 - **To save files**: always write to the current session folder using `save_to_volume`. Session path: {session_output_path}
 
 If the user references a file and you cannot locate it immediately, search the volume before giving up. If you still cannot find it after searching, ask the user to confirm the path or folder.
 
+## Parallel execution
+
+When you need two or more tool calls that do not depend on each other's results (e.g. listing a folder and loading a skill), issue them together in a single `batch` call instead of one at a time. Calls that depend on an earlier result (e.g. `read_from_volume` before `execute_python`) must still be made in order.
+
 ## Guidelines
 
 - Never attempt a skill-related task without first calling `load_skill` (unless already loaded this conversation)
@@ -92,9 +174,78 @@ If the user references a file and you cannot locate it immediately, search the v
 - If a skill isn't appropriate for the task, explain what you can and cannot do
 """
 
-    def _get_request_config(self, session_id: str) -> AgentConfig:
-        """Return a config copy scoped to the given session_id."""
-        return dataclasses.replace(self.config, session_id=session_id)
+
+@functools.lru_cache(maxsize=32)
+def _render_system_prompt(skill_context: str, uc_volume_path: str, session_output_path: str) -> str:
+    """Render the system prompt; cached because each session reuses the same inputs."""
+    return _SYSTEM_PROMPT_TEMPLATE.format(
+        skill_context=skill_context,
+        uc_volume_path=uc_volume_path,
+        session_output_path=session_output_path,
+    )
+
+
+class DocumentAgent:
+    """LangGraph-based document agent with tool-calling workflow."""
+
+    def __init__(self, config: AgentConfig | None = None):
+        self.config = config or AgentConfig.from_env()
+        self._checkpointer = _GCPausedMemorySaver()
+        self._session_configs: OrderedDict[str, AgentConfig] = OrderedDict()
+        self._session_configs_lock = threading.Lock()
+        self._compiled_graph = None
+
+    @functools.cached_property
+    def llm(self) -> ChatDatabricks:
+        """Chat model, created on first use so constructing the agent stays cheap."""
+        return ChatDatabricks(
+            endpoint=self.config.model_endpoint,
+            workspace_client=self.workspace_client,
+            temperature=0.1,
+            request_timeout=self.config.llm_timeout,
+        )
+
+    @functools.cached_property
+    def llm_with_tools(self) -> Runnable:
+        """Chat model with AGENT_TOOLS bound once instead of on every call."""
+        return self.llm.bind_tools(AGENT_TOOLS)
+
+    @functools.cached_property
+    def workspace_client(self) -> WorkspaceClient:
+        """Workspace client, created on first use."""
+        return self._create_workspace_client()
+
+    @property
+    def skill_context(self) -> str:
+        """Skill summary for the system prompt; re-rendered only when a skill changes."""
+        return build_skill_context(self.config)
+
+    def _create_workspace_client(self) -> WorkspaceClient:
+        """Return the shared workspace client for this runtime identity or local profile."""
+        return get_workspace_client(self.config)
+
+    def _build_system_prompt(self, session_output_path: str) -> str:
+        """Build the system prompt with skill and storage context."""
+        return _render_system_prompt(
+            self.skill_context, self.config.uc_volume_path, session_output_path
+        )
+
+    def request_config(self, session_id: str) -> AgentConfig:
+        """Return a config copy scoped to the given session_id.
+
+        Copies are cached (LRU) per session so graph steps within a conversation
+        reuse one instance instead of re-running dataclasses.replace each time.
+        """
+        with self._session_configs_lock:
+            request_config = self._session_configs.get(session_id)
+            if request_config is not None:
+                self._session_configs.move_to_end(session_id)
+                return request_config
+            request_config = dataclasses.replace(self.config, session_id=session_id)
+            self._session_configs[session_id] = request_config
+            if len(self._session_configs) > _MAX_SESSION_CONFIGS:
+                self._session_configs.popitem(last=False)
+            return request_config
 
     def _ensure_system_prompt(
         self, messages: list[BaseMessage], session_output_path: str
@@ -111,21 +262,19 @@ If the user references a file and you cannot locate it immediately, search the v
 
     def agent_node(self, state: AgentState, config: RunnableConfig) -> AgentState:
         """Main agent node - calls the LLM with tools."""
-        session_id = state.get("session_id") or self.config.session_id
-        request_config = self._get_request_config(session_id)
+        state_session_id = state.get("session_id")
+        session_id = state_session_id or self.config.session_id
+        request_config = self.request_config(session_id)
 
         messages = self._ensure_system_prompt(state["messages"], request_config.session_output_path)
         iteration = state.get("iteration_count", 0)
-        tool_context = ToolContext.from_dict(state.get("tool_context") or {})
 
         logger.info("[agent_node] Iteration %s with %s message(s)", iteration + 1, len(messages))
-        # Pass LangGraph's config so its streaming callbacks can forward individual
-        # tokens as they arrive (stream_mode="messages"). Accumulate chunks into a
-        # final message for the state update.
-        response = None
-        for chunk in self.llm.stream(messages, tools=AGENT_TOOLS, config=config):
-            response = chunk if response is None else response + chunk
-        has_tools = bool(response.tool_calls) if hasattr(response, "tool_calls") else False
+        # The sync path serves invoke(), where nobody consumes individual tokens,
+        # so request the whole message at once. LangChain still switches to
+        # streaming internally if a streaming callback is attached via config.
+        response = self.llm_with_tools.invoke(messages, config=config)
+        has_tools = bool(getattr(response, "tool_calls", None))
         usage = response.usage_metadata or {}
         logger.info(
             "[agent_node] LLM responded. tool_calls=%s | tokens: input=%s, output=%s",
@@ -134,29 +283,24 @@ If the user references a file and you cannot locate it immediately, search the v
             usage.get("output_tokens", "n/a"),
         )
 
-        return {
-            "messages": [response],
-            "iteration_count": iteration + 1,
-            "tool_context": tool_context.to_dict(),
-            "session_id": session_id,
-            "input_tokens": usage.get("input_tokens", 0),
-            "output_tokens": usage.get("output_tokens", 0),
-        }
+        return _agent_update(state_session_id, session_id, iteration + 1, response, usage)
 
     async def agent_node_async(self, state: AgentState, config: RunnableConfig) -> AgentState:
         """Async version of agent_node — lets the event loop yield between tokens."""
-        session_id = state.get("session_id") or self.config.session_id
-        request_config = self._get_request_config(session_id)
+        state_session_id = state.get("session_id")
+        session_id = state_session_id or self.config.session_id
+        request_config = self.request_config(session_id)
 
         messages = self._ensure_system_prompt(state["messages"], request_config.session_output_path)
         iteration = state.get("iteration_count", 0)
-        tool_context = ToolContext.from_dict(state.get("tool_context") or {})
 
         logger.info("[agent_node_async] Iteration %s with %s message(s)", iteration + 1, len(messages))
-        response = None
-        async for chunk in self.llm.astream(messages, tools=AGENT_TOOLS, config=config):
-            response = chunk if response is None else response + chunk
-        has_tools = bool(response.tool_calls) if hasattr(response, "tool_calls") else False
+        # Pass LangGraph's config so its streaming callbacks can forward individual
+        # tokens as they arrive (stream_mode="messages"). Accumulate chunks into a
+        # final message for the state update.
+        chunks = [chunk async for chunk in self.llm_with_tools.astream(messages, config=config)]
+        response = _merge_chunks(chunks)
+        has_tools = bool(getattr(response, "tool_calls", None))
         usage = response.usage_metadata or {}
         logger.info(
             "[agent_node_async] LLM responded. tool_calls=%s | tokens: input=%s, output=%s",
@@ -165,58 +309,85 @@ If the user references a file and you cannot locate it immediately, search the v
             usage.get("output_tokens", "n/a"),
         )
 
-        return {
-            "messages": [response],
-            "iteration_count": iteration + 1,
-            "tool_context": tool_context.to_dict(),
-            "session_id": session_id,
-            "input_tokens": usage.get("input_tokens", 0),
-            "output_tokens": usage.get("output_tokens", 0),
-        }
+        return _agent_update(state_session_id, session_id, iteration + 1, response, usage)
 
     def tool_node(self, state: AgentState) -> AgentState:
         """Execute tool calls from the LLM response."""
         messages = state["messages"]
+        tool_calls = getattr(messages[-1], "tool_calls", None) if messages else None
+        if not tool_calls:
+            # Nothing to run, so nothing in the state changes.
+            return {"messages": []}
+
         session_id = state.get("session_id") or self.config.session_id
-        request_config = self._get_request_config(session_id)
+        request_config = self.request_config(session_id)
         tool_context = ToolContext.from_dict(state.get("tool_context") or {})
+        tool_names = [tool_call["name"] for tool_call in tool_calls]
+
+        logger.info("[tool_node] Executing %s tool call(s)", len(tool_calls))
+        # Independent I/O-bound calls overlap on worker threads.
+        tool_messages = run_in_groups(
+            tool_names,
+            lambda index: self._run_tool_call(request_config, tool_calls[index], tool_context),
+            _MAX_TOOL_WORKERS,
+        )
 
-        if not messages:
-            return {
-                "messages": [],
-                "iteration_count": state.get("iteration_count", 0),
-                "tool_context": tool_context.to_dict(),
-                "session_id": session_id,
-            }
+        # Only return keys that changed; LangGraph keeps the rest of the state as is.
+        update: dict[str, Any] = {"messages": tool_messages}
+        # Context-free tools cannot have changed the context, so leave it out.
+        if not CONTEXT_FREE_TOOLS.issuperset(tool_names):
+            update["tool_context"] = tool_context.to_dict()
+        return update
 
-        last_message = messages[-1]
-        tool_messages: list[ToolMessage] = []
+    async def tool_node_async(self, state: AgentState) -> AgentState:
+        """Async version of tool_node — runs each independent group on worker threads.
 
-        if isinstance(last_message, AIMessage) and last_message.tool_calls:
-            logger.info("[tool_node] Executing %s tool call(s)", len(last_message.tool_calls))
-            for tool_call in last_message.tool_calls:
-                tool_name = tool_call["name"]
-                tool_args = tool_call["args"]
-                tool_id = tool_call["id"]
-
-                logger.info("[tool_node] Running tool '%s'", tool_name)
-
-                with mlflow.start_span(name=f"tool:{tool_name}") as span:
-                    span.set_attribute("tool.name", tool_name)
-                    span.set_attribute("tool.call_id", tool_id)
-                    span.set_inputs({"tool_name": tool_name, "tool_args": tool_args})
-                    result = handle_tool_call(request_config, tool_name, tool_args, tool_context)
-                    span.set_outputs({"result": result})
-
-                logger.info("[tool_node] Tool '%s' completed", tool_name)
-                tool_messages.append(ToolMessage(content=result, tool_call_id=tool_id))
-
-        return {
-            "messages": tool_messages,
-            "iteration_count": state.get("iteration_count", 0),
-            "tool_context": tool_context.to_dict(),
-            "session_id": session_id,
-        }
+        asyncio.to_thread copies the current context, so MLflow spans opened in
+        the workers stay attached to this trace.
+        """
+        messages = state["messages"]
+        tool_calls = getattr(messages[-1], "tool_calls", None) if messages else None
+        if not tool_calls:
+            return {"messages": []}
+
+        session_id = state.get("session_id") or self.config.session_id
+        request_config = self.request_config(session_id)
+        tool_context = ToolContext.from_dict(state.get("tool_context") or {})
+        tool_names = [tool_call["name"] for tool_call in tool_calls]
+        tool_messages: list[ToolMessage | None] = [None] * len(tool_calls)
+
+        logger.info("[tool_node_async] Executing %s tool call(s)", len(tool_calls))
+        for group in group_tool_calls(tool_names):
+            results = await asyncio.gather(
+                *(
+                    asyncio.to_thread(
+                        self._run_tool_call, request_config, tool_calls[index], tool_context
+                    )
+                    for index in group
+                )
+            )
+            for index, tool_message in zip(group, results):
+                tool_messages[index] = tool_message
+
+        update: dict[str, Any] = {"messages": tool_messages}
+        if not CONTEXT_FREE_TOOLS.issuperset(tool_names):
+            update["tool_context"] = tool_context.to_dict()
+        return update
+
+    def _run_tool_call(
+        self, request_config: AgentConfig, tool_call: dict[str, Any], tool_context: ToolContext
+    ) -> ToolMessage:
+        """Run a single tool call inside an MLflow span."""
+        tool_name = tool_call["name"]
+        tool_args = tool_call["args"]
+        tool_id = tool_call["id"]
+
+        logger.info("[tool_node] Running tool '%s'", tool_name)
+
+        result = traced_tool_call(request_config, tool_name, tool_args, tool_context, tool_id)
+
+        logger.info("[tool_node] Tool '%s' completed", tool_name)
+        return ToolMessage(content=result, tool_call_id=tool_id)
 
     def should_continue(self, state: AgentState) -> Literal["tools", "end"]:
         """Determine if the agent should continue or end."""
@@ -237,14 +408,23 @@ If the user references a file and you cannot locate it immediately, search the v
         return "end"
 
     def build(self):
-        """Build and compile the LangGraph workflow."""
+        """Build and compile the LangGraph workflow.
+
+        A single compiled graph serves both entry points: each node carries a
+        sync and an async implementation, so invoke() runs agent_node/tool_node
+        and astream() runs their async counterparts against the same checkpointer.
+        """
         if self._compiled_graph is not None:
             return self._compiled_graph
 
         logger.info("Compiling DocumentAgent graph")
         workflow = StateGraph(AgentState)
-        workflow.add_node("agent", self.agent_node)
-        workflow.add_node("tools", self.tool_node)
+        workflow.add_node(
+            "agent", RunnableLambda(self.agent_node, afunc=self.agent_node_async, name="agent")
+        )
+        workflow.add_node(
+            "tools", RunnableLambda(self.tool_node, afunc=self.tool_node_async, name="tools")
+        )
         workflow.set_entry_point("agent")
         workflow.add_conditional_edges("agent", self.should_continue, {"tools": "tools", "end": END})
         workflow.add_edge("tools", "agent")
@@ -252,22 +432,17 @@ If the user references a file and you cannot locate it immediately, search the v
         self._compiled_graph = workflow.compile(checkpointer=self._checkpointer)
         return self._compiled_graph
 
-    def build_async(self):
-        """Build and compile the async LangGraph workflow (uses async agent_node)."""
-        if self._async_compiled_graph is not None:
-            return self._async_compiled_graph
+    def _end_run(self, thread_config: RunnableConfig, run_directory: str) -> None:
+        """Remove a run's scratch directory and drop the checkpointed references to it.
 
-        logger.info("Compiling async DocumentAgent graph")
-        workflow = StateGraph(AgentState)
-        workflow.add_node("agent", self.agent_node_async)
-        workflow.add_node("tools", self.tool_node)
-        workflow.set_entry_point("agent")
-        workflow.add_conditional_edges("agent", self.should_continue, {"tools": "tools", "end": END})
-        workflow.add_edge("tools", "agent")
-
-        # Share the same checkpointer so invoke() and astream() see the same history.
-        self._async_compiled_graph = workflow.compile(checkpointer=self._checkpointer)
-        return self._async_compiled_graph
+        The checkpointed tool_context would otherwise keep pointing at the
+        deleted directory and the files read into it.
+        """
+        shutil.rmtree(run_directory, ignore_errors=True)
+        try:
+            self.build().update_state(thread_config, {"tool_context": {}})
+        except Exception:
+            logger.warning("[agent] Could not clear tool_context after the run", exc_info=True)
 
     def invoke(self, messages: list[BaseMessage], session_id: str, iteration_count: int = 0):
         """Invoke the agent graph with the provided messages."""
@@ -275,17 +450,22 @@ If the user references a file and you cannot locate it immediately, search the v
             "Invoking DocumentAgent with %s message(s) [session=%s]", len(messages), session_id
         )
         thread_config = {"configurable": {"thread_id": session_id}}
-        final_state = self.build().invoke(
-            {
-                "messages": messages,
-                "session_id": session_id,
-                "iteration_count": iteration_count,
-                "tool_context": {},
-                "input_tokens": 0,
-                "output_tokens": 0,
-            },
-            config=thread_config,
-        )
+        run_directory = tempfile.mkdtemp(prefix="agent_run_")
+        try:
+            final_state = self.build().invoke(
+                {
+                    "messages": messages,
+                    "session_id": session_id,
+                    "iteration_count": iteration_count,
+                    "tool_context": {"run_directory": run_directory},
+                    "input_tokens": 0,
+                    "output_tokens": 0,
+                },
+                config=thread_config,
+                durability=_CHECKPOINT_DURABILITY,
+            )
+        finally:
+            self._end_run(thread_config, run_directory)
         logger.info(
             "[agent] Run complete. Total tokens — input=%s, output=%s",
             final_state.get("input_tokens", "n/a"),
@@ -299,22 +479,29 @@ If the user references a file and you cannot locate it immediately, search the v
         """Async-stream the agent graph at the token level.
 
         Yields (chunk, metadata) tuples from LangGraph's messages streaming mode.
-        Uses the async graph so the event loop can interleave between tokens.
+        Runs the async agent node so the event loop can interleave between tokens.
         """
         logger.info(
             "Async-streaming DocumentAgent with %s message(s) [session=%s]", len(messages), session_id
         )
         thread_config = {"configurable": {"thread_id": session_id}}
+        run_directory = tempfile.mkdtemp(prefix="agent_run_")
         initial_state = {
             "messages": messages,
             "session_id": session_id,
             "iteration_count": iteration_count,
-            "tool_context": {},
+            "tool_context": {"run_directory": run_directory},
             "input_tokens": 0,
             "output_tokens": 0,
         }
-        async for item in self.build_async().astream(
-            initial_state, config=thread_config, stream_mode="messages"
-        ):
-            yield item
+        try:
+            async for item in self.build().astream(
+                initial_state,
+                config=thread_config,
+                stream_mode="messages",
+                durability=_CHECKPOINT_DURABILITY,
+            ):
+                yield item
+        finally:
+            await asyncio.to_thread(self._end_run, thread_config, run_directory)
         logger.info("[agent] Async streaming run complete.")
@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import dataclasses
 import hashlib
 import uuid
 from collections.abc import AsyncGenerator
@@ -19,6 +18,45 @@ from mlflow.types.responses import (
 from .config import AgentConfig
 from .graph import DocumentAgent
 
+try:
+    from mlflow.genai.agent_server.server import get_request_headers
+except ImportError:  # older MLflow without the agent server
+    def get_request_headers() -> dict[str, str]:
+        return {}
+
+# Sentinel for content parts that carry no text.
+_MISSING = object()
+
+# Responses API role -> LangChain message class. Other roles are dropped.
+_ROLE_TO_MESSAGE_CLASS = {"user": HumanMessage, "assistant": AIMessage, "system": SystemMessage}
+
+
+def _content_part_text(item: Any) -> Any:
+    """Return the text of a content part, or _MISSING when it has none."""
+    if isinstance(item, dict):
+        text = item.get("text", _MISSING)
+        return text if text is _MISSING else str(text)
+    return getattr(item, "text", _MISSING)
+
+
+async def _iter_text_deltas(
+    stream: AsyncGenerator[tuple[Any, dict[str, Any]], None],
+) -> AsyncGenerator[str, None]:
+    """Narrow a messages-mode stream to the agent's user-visible text deltas.
+
+    Tool-call chunks, tool messages and empty chunks are dropped here so the
+    caller only sees strings it can forward as-is.
+    """
+    async for msg_chunk, metadata in stream:
+        if metadata.get("langgraph_node") != "agent":
+            continue
+        if not isinstance(msg_chunk, AIMessageChunk):
+            continue
+        content = msg_chunk.content
+        if not content or msg_chunk.tool_call_chunks:
+            continue
+        yield content if isinstance(content, str) else str(content)
+
 
 class DocumentResponsesAgent(ResponsesAgent):
     """MLflow ResponsesAgent wrapper for DocumentAgent."""
@@ -26,6 +64,8 @@ class DocumentResponsesAgent(ResponsesAgent):
     def __init__(self, config: AgentConfig | None = None):
         self.config = config or AgentConfig.from_env()
         self.document_agent = DocumentAgent(self.config)
+        # Compile the graph at startup rather than on the first request.
+        self.document_agent.build()
 
     @staticmethod
     def _extract_text_content(content: Any) -> str:
@@ -33,34 +73,28 @@ class DocumentResponsesAgent(ResponsesAgent):
         if isinstance(content, str):
             return content
         if isinstance(content, list):
-            text_parts: list[str] = []
-            for item in content:
-                if hasattr(item, "text"):
-                    text_parts.append(item.text)
-                elif isinstance(item, dict) and "text" in item:
-                    text_parts.append(str(item["text"]))
-            return " ".join(text_parts)
+            return " ".join(
+                text for text in map(_content_part_text, content) if text is not _MISSING
+            )
         return str(content or "")
 
     @classmethod
     def _to_langchain_messages(cls, messages: list[Any]) -> list:
         """Convert Responses API messages to LangChain message objects."""
         lc_messages = []
+        append = lc_messages.append
+        extract = cls._extract_text_content
         for msg in messages:
-            if hasattr(msg, "role"):
-                role = msg.role
-                content = msg.content if hasattr(msg, "content") else ""
-            else:
+            if isinstance(msg, dict):
                 role = msg.get("role", "user")
                 content = msg.get("content", "")
+            else:
+                role = getattr(msg, "role", "user")
+                content = getattr(msg, "content", "")
 
-            text_content = cls._extract_text_content(content)
-            if role == "user":
-                lc_messages.append(HumanMessage(content=text_content))
-            elif role == "assistant":
-                lc_messages.append(AIMessage(content=text_content))
-            elif role == "system":
-                lc_messages.append(SystemMessage(content=text_content))
+            message_class = _ROLE_TO_MESSAGE_CLASS.get(role)
+            if message_class is not None:
+                append(message_class(content=extract(content)))
         return lc_messages
 
     @staticmethod
@@ -76,7 +110,7 @@ class DocumentResponsesAgent(ResponsesAgent):
         """Build a standard ResponsesAgentResponse payload."""
         return ResponsesAgentResponse(
             output=[{
-                "id": str(uuid.uuid4()),
+                "id": uuid.uuid4().hex,
                 "type": "message",
                 "role": "assistant",
                 "content": [{"type": "output_text", "text": text}],
@@ -92,7 +126,6 @@ class DocumentResponsesAgent(ResponsesAgent):
         behave like a fresh single-turn conversation.
         """
         try:
-            from mlflow.genai.agent_server.server import get_request_headers
             headers = get_request_headers()
         except Exception:
             headers = {}
@@ -101,12 +134,16 @@ class DocumentResponsesAgent(ResponsesAgent):
         custom_inputs = getattr(request, "custom_inputs", None) or {}
         if not isinstance(custom_inputs, dict):
             custom_inputs = {}
-        conversation_id = custom_inputs.get("conversation_id") or str(uuid.uuid4())
+        conversation_id = custom_inputs.get("conversation_id") or uuid.uuid4().hex
         return f"{user}:{conversation_id}"
 
     @staticmethod
     def _session_id_from_thread(thread_id: str) -> str:
-        """Derive a stable 8-char session_id from a thread_id."""
+        """Derive a stable 8-char session_id from a thread_id.
+
+        Existing sessions and their output folders are keyed on this value, so
+        the derivation must not change.
+        """
         return hashlib.md5(thread_id.encode()).hexdigest()[:8]
 
     def predict(self, request: ResponsesAgentRequest) -> ResponsesAgentResponse:
@@ -123,7 +160,7 @@ class DocumentResponsesAgent(ResponsesAgent):
             response_content = self._extract_final_response_content(result)
 
             response = self._build_response(response_content)
-            session_config = dataclasses.replace(self.config, session_id=session_id)
+            session_config = self.document_agent.request_config(session_id)
             response.custom_outputs = {
                 "session_id": session_id,
                 "thread_id": thread_id,
@@ -141,7 +178,7 @@ class DocumentResponsesAgent(ResponsesAgent):
             yield ResponsesAgentStreamEvent(
                 type="response.output_item.done",
                 item={
-                    "id": str(uuid.uuid4()),
+                    "id": uuid.uuid4().hex,
                     "type": "message",
                     "role": "assistant",
                     "content": [{"type": "output_text", "text": "No input provided"}],
@@ -155,33 +192,26 @@ class DocumentResponsesAgent(ResponsesAgent):
 
             lc_messages = self._to_langchain_messages(request.input)
             item_id = "msg_" + session_id
-            final_content = ""
+            content_parts: list[str] = []
 
-            async for msg_chunk, metadata in self.document_agent.astream(
-                lc_messages, session_id=session_id, iteration_count=0
+            async for delta in _iter_text_deltas(
+                self.document_agent.astream(lc_messages, session_id=session_id, iteration_count=0)
             ):
-                if (
-                    isinstance(msg_chunk, AIMessageChunk)
-                    and metadata.get("langgraph_node") == "agent"
-                    and msg_chunk.content
-                    and not getattr(msg_chunk, "tool_call_chunks", None)
-                ):
-                    delta = str(msg_chunk.content)
-                    final_content += delta
-                    yield ResponsesAgentStreamEvent(
-                        type="response.output_text.delta",
-                        item_id=item_id,
-                        delta=delta,
-                    )
-
-            session_config = dataclasses.replace(self.config, session_id=session_id)
+                content_parts.append(delta)
+                yield ResponsesAgentStreamEvent(
+                    type="response.output_text.delta",
+                    item_id=item_id,
+                    delta=delta,
+                )
+
+            session_config = self.document_agent.request_config(session_id)
             yield ResponsesAgentStreamEvent(
                 type="response.output_item.done",
                 item={
                     "id": item_id,
                     "type": "message",
                     "role": "assistant",
-                    "content": [{"type": "output_text", "text": final_content}],
+                    "content": [{"type": "output_text", "text": "".join(content_parts)}],
                     "custom_outputs": {
                         "session_id": session_id,
                         "thread_id": thread_id,
@@ -193,7 +223,7 @@ class DocumentResponsesAgent(ResponsesAgent):
             yield ResponsesAgentStreamEvent(
                 type="response.output_item.done",
                 item={
-                    "id": str(uuid.uuid4()),
+                    "id": uuid.uuid4().hex,
                     "type": "message",
                     "role": "assistant",
                     "content": [{"type": "output_text", "text": f"Error: {str(e)}"}],
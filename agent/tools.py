@@ -4,22 +4,39 @@ from __future__ import annotations
 
 import base64
 import binascii
+import contextvars
+import functools
 import logging
 import os
+import posixpath
+import re
+import reprlib
 import shutil
+import signal
 import subprocess
 import sys
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
 from pathlib import Path
-from typing import Any
+from types import CodeType
+from typing import Any, BinaryIO, Callable
 
+import mlflow
 from databricks.sdk import WorkspaceClient
 
+try:  # optional SIMD base64 codec; same API and errors as the stdlib module
+    import pybase64
+except ImportError:
+    pybase64 = None
+
 from .config import AgentConfig
 
 logger = logging.getLogger(__name__)
 
+_b64encode = pybase64.b64encode if pybase64 is not None else base64.b64encode
+
 
 class ToolContext:
     """Per-request context for tool execution state.
@@ -28,38 +45,103 @@ class ToolContext:
     a single agent invocation, but must be isolated between concurrent requests.
     """
 
+    __slots__ = (
+        "last_execute_result",
+        "last_read_from_volume",
+        "last_read_many_from_volume",
+        "bash_working_directory",
+        "run_directory",
+    )
+
     def __init__(self):
-        self.last_execute_result: dict[str, str] = {}
+        self.last_execute_result: dict[str, Any] = {}
         self.last_read_from_volume: dict[str, Any] = {}
+        self.last_read_many_from_volume: dict[str, dict[str, Any]] = {}
         self.bash_working_directory: str | None = None
+        # Per-run scratch directory for local copies of read files; the run's
+        # owner creates it and removes it when the run ends.
+        self.run_directory: str | None = None
 
     def to_dict(self) -> dict[str, Any]:
         return {
             "last_execute_result": self.last_execute_result,
             "last_read_from_volume": self.last_read_from_volume,
+            "last_read_many_from_volume": self.last_read_many_from_volume,
             "bash_working_directory": self.bash_working_directory,
+            "run_directory": self.run_directory,
         }
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "ToolContext":
-        ctx = cls()
+        # Every attribute is assigned below, so skip __init__'s placeholder dicts.
+        ctx = cls.__new__(cls)
         ctx.last_execute_result = data.get("last_execute_result") or {}
         ctx.last_read_from_volume = data.get("last_read_from_volume") or {}
+        ctx.last_read_many_from_volume = data.get("last_read_many_from_volume") or {}
         ctx.bash_working_directory = data.get("bash_working_directory")
+        ctx.run_directory = data.get("run_directory")
         return ctx
 
 
-def _get_workspace_client(config: AgentConfig) -> WorkspaceClient:
-    """Create a workspace client using runtime identity or local profile."""
-    if config.is_running_in_databricks:
+_workspace_client_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_workspace_client(is_in_databricks: bool, profile: str | None) -> WorkspaceClient:
+    """Create a workspace client once per identity and share it across callers."""
+    if is_in_databricks:
         return WorkspaceClient()
-    if config.databricks_profile:
-        return WorkspaceClient(profile=config.databricks_profile)
+    if profile:
+        return WorkspaceClient(profile=profile)
     return WorkspaceClient()
 
 
+def get_workspace_client(config: AgentConfig) -> WorkspaceClient:
+    """Return the workspace client for the runtime identity or local profile."""
+    # lru_cache does not stop concurrent first calls from each building a client
+    # (and running auth); the lock makes parallel tool calls share one.
+    with _workspace_client_lock:
+        return _cached_workspace_client(config.is_running_in_databricks, config.databricks_profile)
+
+
+# Upper bound on concurrent downloads for read_many_from_volume.
+_MAX_READ_WORKERS = 8
+
+# Upper bound on concurrent directory listings in list_volume_files.
+_MAX_LIST_WORKERS = 16
+
+# Buffer size when streaming volume downloads to local temporary files.
+_DOWNLOAD_CHUNK_BYTES = 1024 * 1024
+
+# (skill directory mtimes, ((skill id, skill dir, SKILL.md mtime), ...)).
+_SkillSignature = tuple[tuple[int | None, ...], tuple[tuple[str, str, int | None], ...]]
+
+
+# (metadata list, name index) keyed by _skill_metadata_signature; cleared when full.
+_SKILL_METADATA_CACHE: dict[
+    _SkillSignature,
+    tuple[list[dict[str, str]], dict[str, str]],
+] = {}
+_MAX_SKILL_METADATA_ENTRIES = 16
+
+# Rendered skill context keyed like _SKILL_METADATA_CACHE, so a skill being
+# added, removed or having its frontmatter edited re-renders it; cleared when full.
+_SKILL_CONTEXT_CACHE: dict[_SkillSignature, str] = {}
+
+
 def build_skill_context(config: AgentConfig) -> str:
     """Build system context from skill metadata (without loading full content)."""
+    cache_key = _skill_metadata_signature(config)
+    skill_context = _SKILL_CONTEXT_CACHE.get(cache_key)
+    if skill_context is None:
+        if len(_SKILL_CONTEXT_CACHE) >= _MAX_SKILL_METADATA_ENTRIES:
+            _SKILL_CONTEXT_CACHE.clear()
+        skill_context = _SKILL_CONTEXT_CACHE[cache_key] = _render_skill_context(config)
+    return skill_context
+
+
+def _render_skill_context(config: AgentConfig) -> str:
+    """Render the skill summary that build_skill_context caches."""
     skill_metadata_list = get_skill_metadata_list(config)
     if not skill_metadata_list:
         return ""
@@ -81,10 +163,17 @@ Use the `load_skill` tool when you need the full instructions for a specific ski
 def load_skill_instructions(config: AgentConfig, skill_name: str) -> str:
     """Load the full SKILL.md instructions for a skill."""
     skill_path = config.get_skill_path(skill_name) / "SKILL.md"
-    if not skill_path.exists():
+    try:
+        mtime_ns = skill_path.stat().st_mtime_ns
+    except FileNotFoundError:
         return ""
+    return _read_skill_body(str(skill_path), mtime_ns)
+
 
-    content = skill_path.read_text()
+@functools.lru_cache(maxsize=64)
+def _read_skill_body(skill_md_path: str, mtime_ns: int) -> str:
+    """Read SKILL.md without its frontmatter; mtime_ns in the key drops stale entries."""
+    content = Path(skill_md_path).read_text()
 
     # Remove YAML frontmatter
     if content.startswith("---"):
@@ -95,20 +184,64 @@ def load_skill_instructions(config: AgentConfig, skill_name: str) -> str:
     return content
 
 
+def _skill_metadata_signature(config: AgentConfig) -> _SkillSignature:
+    """Skill directory mtimes plus (skill id, skill dir, SKILL.md mtime) per skill.
+
+    The directory mtimes change when a skill is added or removed; the
+    per-skill mtimes change when a SKILL.md is edited.
+    """
+    skills = []
+    for skill_id in config.available_skills:
+        skill_dir = config.get_skill_path(skill_id)
+        try:
+            mtime_ns: int | None = (skill_dir / "SKILL.md").stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime_ns = None
+        skills.append((skill_id, str(skill_dir), mtime_ns))
+    return config.skill_directory_mtimes(), tuple(skills)
+
+
+def _cached_skill_metadata(
+    config: AgentConfig,
+) -> tuple[list[dict[str, str]], dict[str, str]]:
+    """Skill metadata list and name index, cached by _skill_metadata_signature.
+
+    The per-skill metadata lookups only run again when a skill changes.
+    """
+    signature = _skill_metadata_signature(config)
+    cached = _SKILL_METADATA_CACHE.get(signature)
+    if cached is None:
+        skills: list[dict[str, str]] = []
+        name_index: dict[str, str] = {}
+        for skill_id, skill_dir, _mtime_ns in signature[1]:
+            metadata = config.load_skill_metadata(skill_id)
+            name = metadata.get("name", skill_id)
+            skills.append(
+                {
+                    "id": skill_id,
+                    "name": name,
+                    "description": metadata.get("description", "No description available"),
+                    "path": skill_dir,
+                }
+            )
+            name_index[skill_id] = skill_id
+            name_index[name] = skill_id
+        if len(_SKILL_METADATA_CACHE) >= _MAX_SKILL_METADATA_ENTRIES:
+            _SKILL_METADATA_CACHE.clear()
+        cached = _SKILL_METADATA_CACHE[signature] = (skills, name_index)
+    return cached
+
+
 def get_skill_metadata_list(config: AgentConfig) -> list[dict[str, str]]:
     """Get skill metadata without loading full content (efficient for listing)."""
-    skills: list[dict[str, str]] = []
-    for skill_id in config.available_skills:
-        metadata = config.load_skill_metadata(skill_id)
-        skills.append(
-            {
-                "id": skill_id,
-                "name": metadata.get("name", skill_id),
-                "description": metadata.get("description", "No description available"),
-                "path": str(config.get_skill_path(skill_id)),
-            }
-        )
-    return skills
+    skills, _name_index = _cached_skill_metadata(config)
+    return [dict(skill) for skill in skills]
+
+
+def skill_name_index(config: AgentConfig) -> dict[str, str]:
+    """Map each skill id and frontmatter name to its skill id (treat as read-only)."""
+    _skills, name_index = _cached_skill_metadata(config)
+    return name_index
 
 
 def list_skills(config: AgentConfig) -> dict[str, Any]:
@@ -125,17 +258,58 @@ def list_skills(config: AgentConfig) -> dict[str, Any]:
 # Unity Catalog Volume Operations
 # =============================================================================
 
+# Base64 alphabet (no whitespace: every strict decoder below rejects it).
+_B64_PREFIX_RE = re.compile(r"[A-Za-z0-9+/=]*")
+_B64_PREFIX_CHARS = 64
+
+
+def _b64decode_strict(data: str) -> bytes:
+    """Decode base64, rejecting any character outside the alphabet.
+
+    Payloads with a non-multiple-of-4 length or a bad first 64 characters (the
+    usual shape of text or JSON sent by mistake) are rejected before the decoder
+    scans the whole input. pybase64 validates in its SIMD decoder; otherwise
+    Python 3.11+ validates inside binascii's C decoder (strict_mode), and older
+    versions fall back to b64decode(validate=True), which pre-scans with a regex.
+    """
+    if len(data) % 4:
+        raise binascii.Error("length is not a multiple of 4")
+    if not _B64_PREFIX_RE.fullmatch(data, 0, _B64_PREFIX_CHARS):
+        raise binascii.Error("non-base64 character in the first 64 characters")
+    if pybase64 is not None:
+        return pybase64.b64decode(data, validate=True)
+    if sys.version_info >= (3, 11):
+        return binascii.a2b_base64(data.encode("ascii"), strict_mode=True)
+    return base64.b64decode(data, validate=True)
+
+
+# Volume directories this process has already created; skips a round-trip per save.
+_CREATED_UC_DIRECTORIES: set[str] = set()
+
+
+def _ensure_uc_directory(workspace_client: WorkspaceClient, directory: str) -> None:
+    """Create a volume directory unless this process already created it."""
+    if directory in _CREATED_UC_DIRECTORIES:
+        return
+    workspace_client.files.create_directory(directory)
+    _CREATED_UC_DIRECTORIES.add(directory)
+
+
 def save_to_uc_volume(
     config: AgentConfig,
     filename: str,
-    content: bytes | str,
+    content: bytes | bytearray | memoryview | str | BinaryIO,
     content_type: str = "application/octet-stream"
 ) -> dict[str, Any]:
-    """Save a file to the Unity Catalog Volume."""
+    """Save a file to the Unity Catalog Volume.
+
+    content may be raw bytes, a base64 string, or a readable binary file object,
+    which is streamed to the destination without being read into memory first.
+    """
     try:
         if isinstance(content, str):
             try:
-                content = base64.b64decode(content, validate=True)
+                content = _b64decode_strict(content)
             except (binascii.Error, ValueError) as exc:
                 return {
                     "success": False,
@@ -147,16 +321,21 @@ def save_to_uc_volume(
         full_path = f"{output_dir}/{filename}"
 
         if full_path.startswith("/Volumes/"):
-            workspace_client = _get_workspace_client(config)
+            workspace_client = get_workspace_client(config)
             try:
-                workspace_client.files.create_directory(output_dir)
+                _ensure_uc_directory(workspace_client, output_dir)
             except Exception:
                 pass
-            workspace_client.files.upload(full_path, BytesIO(content), overwrite=True)
+            # BytesIO over immutable bytes shares the buffer instead of copying it.
+            stream = content if hasattr(content, "read") else BytesIO(content)
+            workspace_client.files.upload(full_path, stream, overwrite=True)
         else:
             os.makedirs(output_dir, exist_ok=True)
             with open(full_path, "wb") as f:
-                f.write(content)
+                if hasattr(content, "read"):
+                    shutil.copyfileobj(content, f)
+                else:
+                    f.write(content)
 
         return {
             "success": True,
@@ -172,6 +351,13 @@ def save_to_uc_volume(
         }
 
 
+def _resolve_volume_path(config: AgentConfig, filename: str) -> str:
+    """Absolute paths are used directly; relative names are scoped to the session folder."""
+    if filename.startswith("/"):
+        return filename
+    return f"{config.session_output_path}/{filename}"
+
+
 def read_from_uc_volume(
     config: AgentConfig,
     filename: str,
@@ -183,28 +369,25 @@ def read_from_uc_volume(
     or an absolute path (used as-is, letting the SDK or OS enforce access).
     """
     try:
-        # Absolute paths are used directly; relative names are scoped to the session folder.
-        if filename.startswith("/"):
-            full_path = filename
-        else:
-            full_path = f"{config.session_output_path}/{filename}"
+        full_path = _resolve_volume_path(config, filename)
 
         if full_path.startswith("/Volumes/"):
-            workspace_client = _get_workspace_client(config)
+            workspace_client = get_workspace_client(config)
             response = workspace_client.files.download(full_path)
             content = response.contents.read() if response.contents is not None else b""
         else:
             with open(full_path, "rb") as f:
                 content = f.read()
 
+        size_bytes = len(content)
         if return_base64:
-            content = base64.b64encode(content).decode("utf-8")
+            content = _b64encode(content).decode("ascii")
 
         return {
             "success": True,
             "path": full_path,
             "content": content,
-            "size_bytes": len(content) if isinstance(content, bytes) else len(base64.b64decode(content))
+            "size_bytes": size_bytes
         }
 
     except FileNotFoundError:
@@ -221,6 +404,87 @@ def read_from_uc_volume(
         }
 
 
+def fetch_from_uc_volume(config: AgentConfig, filename: str, directory: str) -> dict[str, Any]:
+    """Copy a volume file to a local temporary file without holding it in memory.
+
+    Files under /Volumes/ are streamed down in fixed-size chunks; local paths
+    are snapshotted, so later edits to the source don't change what was read.
+    The copy is created in directory, which the caller owns and removes; use
+    discard_fetched_file to release it earlier. Resolves filename exactly like
+    read_from_uc_volume.
+    """
+    temp_path: str | None = None
+    try:
+        full_path = _resolve_volume_path(config, filename)
+        is_volume_path = full_path.startswith("/Volumes/")
+        if not is_volume_path and not os.path.isfile(full_path):
+            raise FileNotFoundError(full_path)
+
+        fd, temp_path = tempfile.mkstemp(
+            prefix="agent_read_", suffix=posixpath.splitext(full_path)[1], dir=directory
+        )
+        if is_volume_path:
+            workspace_client = get_workspace_client(config)
+            response = workspace_client.files.download(full_path)
+            with os.fdopen(fd, "wb") as f:
+                if response.contents is not None:
+                    shutil.copyfileobj(response.contents, f, _DOWNLOAD_CHUNK_BYTES)
+        else:
+            os.close(fd)
+            _copy_local_file(Path(full_path), Path(temp_path))
+
+        return {
+            "success": True,
+            "path": full_path,
+            "local_path": temp_path,
+            "size_bytes": os.path.getsize(temp_path),
+            "is_temporary": True,
+        }
+
+    except FileNotFoundError:
+        error = f"File not found: {filename}"
+    except Exception as e:
+        error = str(e)
+
+    if temp_path is not None:
+        discard_fetched_file({"local_path": temp_path, "is_temporary": True})
+    return {
+        "success": False,
+        "error": error,
+        "path": None
+    }
+
+
+def discard_fetched_file(entry: dict[str, Any]) -> None:
+    """Delete the temporary copy behind a fetch_from_uc_volume result, if any."""
+    if entry.get("is_temporary") and entry.get("local_path"):
+        try:
+            os.remove(entry["local_path"])
+        except OSError:
+            pass
+
+
+def read_many_from_uc_volume(
+    config: AgentConfig,
+    filenames: list[str],
+    directory: str,
+) -> dict[str, dict[str, Any]]:
+    """Fetch several volume files concurrently via fetch_from_uc_volume.
+
+    Returns one result dict per distinct filename, in request order.
+    """
+    unique_filenames = list(dict.fromkeys(filenames))
+    if not unique_filenames:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=min(_MAX_READ_WORKERS, len(unique_filenames))) as pool:
+        results = pool.map(
+            lambda filename: fetch_from_uc_volume(config, filename, directory),
+            unique_filenames,
+        )
+        return dict(zip(unique_filenames, results))
+
+
 def list_uc_volume_files(config: AgentConfig, path: str | None = None) -> dict[str, Any]:
     """List files in a UC Volume directory, recursively.
 
@@ -231,15 +495,33 @@ def list_uc_volume_files(config: AgentConfig, path: str | None = None) -> dict[s
         output_dir = path.rstrip("/") if path and path.startswith("/") else config.session_output_path
 
         if output_dir.startswith("/Volumes/"):
-            workspace_client = _get_workspace_client(config)
+            workspace_client = get_workspace_client(config)
+            list_directory = workspace_client.files.list_directory_contents
+
+            # Fetch listings level by level, with each level's directories
+            # listed concurrently, so latency grows with depth, not folder count.
+            listings: dict[str, list[Any]] = {}
+            pending = [output_dir]
+            with ThreadPoolExecutor(max_workers=_MAX_LIST_WORKERS) as pool:
+                while pending:
+                    level = pending
+                    pending = []
+                    for dir_path, entries in zip(
+                        level, pool.map(lambda d: list(list_directory(d)), level)
+                    ):
+                        listings[dir_path] = entries
+                        pending.extend(entry.path for entry in entries if entry.is_directory)
+
             files: list[dict[str, Any]] = []
+            append_file = files.append
 
             def _collect_uc(dir_path: str) -> None:
-                for entry in workspace_client.files.list_directory_contents(dir_path):
+                # Assemble in the same depth-first order as a serial walk.
+                for entry in listings[dir_path]:
                     if entry.is_directory:
                         _collect_uc(entry.path)
                     else:
-                        files.append({
+                        append_file({
                             "name": entry.name,
                             "path": entry.path,
                             "size_bytes": entry.file_size,
@@ -263,14 +545,31 @@ def list_uc_volume_files(config: AgentConfig, path: str | None = None) -> dict[s
             }
 
         files = []
-        for root, _dirs, filenames in os.walk(output_dir):
-            for f in filenames:
-                file_path = os.path.join(root, f)
+
+        def _collect_local(dir_path: str) -> None:
+            # Same traversal as os.walk (files first, symlinked dirs not followed,
+            # unreadable dirs skipped), but sizes come from the scandir entry
+            # instead of a path stat each.
+            try:
+                with os.scandir(dir_path) as scandir_it:
+                    entries = list(scandir_it)
+            except OSError:
+                return
+            subdirs: list[str] = []
+            for entry in entries:
+                if entry.is_dir():
+                    if not entry.is_symlink():
+                        subdirs.append(entry.path)
+                    continue
                 files.append({
-                    "name": f,
-                    "size_bytes": os.path.getsize(file_path),
-                    "path": file_path,
+                    "name": entry.name,
+                    "size_bytes": entry.stat().st_size,
+                    "path": entry.path,
                 })
+            for subdir in subdirs:
+                _collect_local(subdir)
+
+        _collect_local(output_dir)
 
         return {
             "success": True,
@@ -287,12 +586,44 @@ def list_uc_volume_files(config: AgentConfig, path: str | None = None) -> dict[s
         }
 
 
+# An absolute path or any ".." component, checked before normalization can fold it away.
+_UNSAFE_PATH_RE = re.compile(r"^/|(?:^|/)\.\.(?:/|$)")
+
+
 def _safe_relative_path(path_value: str) -> str | None:
     """Validate and normalize a relative file path."""
-    candidate = Path(path_value.strip())
-    if candidate.is_absolute() or ".." in candidate.parts:
+    candidate = path_value.strip()
+    if not candidate or _UNSAFE_PATH_RE.search(candidate):
         return None
-    return candidate.as_posix()
+    normalized = posixpath.normpath(candidate)
+    # "." (e.g. from "./") names the directory itself, not a file.
+    return None if normalized == "." else normalized
+
+
+def _copy_local_file(source: Path, target: Path) -> None:
+    """Copy a file and its metadata like shutil.copy2, preferring copy_file_range.
+
+    copy_file_range lets the kernel clone or copy the data without passing it
+    through user space, and can reflink on filesystems that support it.
+    shutil.copy2 (sendfile-based on Linux) remains the fallback. Like copy2,
+    raises shutil.SameFileError instead of truncating a file onto itself.
+    """
+    if os.path.exists(target) and os.path.samefile(source, target):
+        raise shutil.SameFileError(f"{source} and {target} are the same file")
+    copy_file_range = getattr(os, "copy_file_range", None)
+    if copy_file_range is None:
+        shutil.copy2(source, target)
+        return
+
+    try:
+        with open(source, "rb") as src, open(target, "wb") as dst:
+            while copy_file_range(src.fileno(), dst.fileno(), 1 << 30):
+                pass
+    except OSError:
+        # Unsupported by this kernel or filesystem pair; copy2 truncates and redoes it.
+        shutil.copy2(source, target)
+        return
+    shutil.copystat(source, target)
 
 
 def copy_file_to_current_session(
@@ -350,11 +681,19 @@ def copy_file_to_current_session(
             target_path = f"{config.session_output_path}/{safe_target}"
             target_dir = str(Path(target_path).parent)
 
-            workspace_client = _get_workspace_client(config)
-            response = workspace_client.files.download(resolved_source_path)
-            content = response.contents.read() if response.contents is not None else b""
-            workspace_client.files.create_directory(target_dir)
-            workspace_client.files.upload(target_path, BytesIO(content), overwrite=True)
+            workspace_client = get_workspace_client(config)
+            # Create the target folder while the download request is in flight,
+            # then hand the download stream straight to the upload so the file
+            # is never held in memory as a whole.
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                mkdir_future = pool.submit(_ensure_uc_directory, workspace_client, target_dir)
+                response = workspace_client.files.download(resolved_source_path)
+                mkdir_future.result()
+            source_stream = response.contents if response.contents is not None else BytesIO(b"")
+            try:
+                workspace_client.files.upload(target_path, source_stream, overwrite=True)
+            finally:
+                source_stream.close()
 
             return {
                 "success": True,
@@ -387,7 +726,7 @@ def copy_file_to_current_session(
             }
         target_local = Path(config.session_output_path) / safe_target
         target_local.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(source_local, target_local)
+        _copy_local_file(source_local, target_local)
 
         return {
             "success": True,
@@ -404,24 +743,97 @@ def copy_file_to_current_session(
         }
 
 
-def execute_python_code(code: str, context: dict[str, Any] | None = None) -> dict[str, Any]:
-    """Execute Python code in a controlled environment."""
+class _LocalsRepr(reprlib.Repr):
+    """reprlib.Repr that summarizes binary buffers instead of escaping them.
+
+    A document held in source_doc_bytes would otherwise be rendered as a full
+    escaped repr (several times its size) before being truncated, including
+    when it sits inside a container such as source_docs.
+    """
+
+    def _summarize_buffer(self, value: Any, level: int) -> str:
+        return f"<{type(value).__name__} len={len(value)}>"
+
+    repr_bytes = repr_bytearray = repr_memoryview = _summarize_buffer
+
+
+# Bounded repr for execute_python locals previews: truncates while formatting,
+# so a large list or dict is never rendered in full just to be cut to 200 chars.
+_LOCALS_REPR = _LocalsRepr()
+_LOCALS_REPR.maxstring = 200
+_LOCALS_REPR.maxother = 200
+
+
+def _preview_local(value: Any) -> str:
+    """Short preview of a namespace value, at most ~200 characters."""
+    if isinstance(value, str):
+        return value[:200]
+    return _LOCALS_REPR.repr(value)[:200]
+
+
+@functools.lru_cache(maxsize=128)
+def _compile_user_code(code: str) -> CodeType:
+    """Compile execute_python source once; agent retries often resend the same snippet."""
+    return compile(code, "<string>", "exec")
+
+
+class _LazyNamespace(dict):
+    """exec() namespace that computes some names on first access.
+
+    Covers name lookups in the code (module level and inside functions) as
+    well as globals()[...], globals().get(...) and "in" checks.
+    """
+
+    def __init__(self, lazy: dict[str, Callable[[], Any]]):
+        super().__init__()
+        self._lazy = lazy
+
+    def __missing__(self, key: str) -> Any:
+        factory = self._lazy.pop(key, None)
+        if factory is None:
+            raise KeyError(key)
+        value = self[key] = factory()
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key: object) -> bool:
+        return dict.__contains__(self, key) or key in self._lazy
+
+
+def execute_python_code(
+    code: str,
+    context: dict[str, Any] | None = None,
+    lazy_context: dict[str, Callable[[], Any]] | None = None,
+) -> dict[str, Any]:
+    """Execute Python code in a controlled environment.
+
+    lazy_context maps names to zero-argument factories that only run if the
+    code looks the name up.
+    """
     try:
         # Use a single namespace dict so imports, assignments, and function
         # definitions all share the same scope (avoids the exec() split-scope
         # bug where functions can't see names imported into exec_locals).
-        exec_namespace: dict[str, Any] = {"__builtins__": __builtins__}
+        exec_namespace: dict[str, Any] = (
+            _LazyNamespace(dict(lazy_context)) if lazy_context else {}
+        )
+        exec_namespace["__builtins__"] = __builtins__
         if context:
             exec_namespace.update(context)
 
-        exec(code, exec_namespace)
+        exec(_compile_user_code(code), exec_namespace)
 
         result = exec_namespace.get("result", exec_namespace.get("output", None))
 
         return {
             "success": True,
             "result": result,
-            "locals": {k: str(v)[:200] for k, v in exec_namespace.items() if not k.startswith("_")}
+            "locals": {k: _preview_local(v) for k, v in exec_namespace.items() if not k.startswith("_")}
         }
 
     except Exception as e:
@@ -432,6 +844,49 @@ def execute_python_code(code: str, context: dict[str, Any] | None = None) -> dic
         }
 
 
+# How much of a bash command's output is reported back to the model.
+_STDOUT_TAIL_CHARS = 4000
+_STDERR_TAIL_CHARS = 2000
+
+
+def _drain_tail(stream: BinaryIO, tail: bytearray, max_bytes: int) -> None:
+    """Read a pipe to EOF, keeping only its last max_bytes bytes in tail."""
+    with stream:
+        for chunk in iter(lambda: stream.read1(65536), b""):
+            tail += chunk
+            if len(tail) > max_bytes:
+                del tail[:-max_bytes]
+
+
+def _python_on_path_is_current(path_env: str) -> bool:
+    """True if 'python' on path_env already runs this interpreter.
+
+    Compares unresolved paths: a venv's bin/python is a symlink to the base
+    interpreter, and only the venv path picks up its pyvenv.cfg.
+    """
+    found = shutil.which("python", path=path_env)
+    return found is not None and os.path.abspath(found) == os.path.abspath(sys.executable)
+
+
+def _ensure_python_wrapper(working_directory: str) -> str:
+    """Write a .bin/python wrapper for this interpreter, if missing, and return its directory.
+
+    Ensures 'python' resolves even if only 'python3' is on the PATH. Uses a
+    wrapper script (not a symlink) so the real executable's venv detection
+    via pyvenv.cfg continues to work. Checked on every call, since a command
+    may have deleted it.
+    """
+    python_bin_dir = os.path.join(working_directory, ".bin")
+    python_wrapper = os.path.join(python_bin_dir, "python")
+    if not os.path.lexists(python_wrapper):
+        os.makedirs(python_bin_dir, exist_ok=True)
+        real_python = os.path.abspath(sys.executable)
+        with open(python_wrapper, "w") as f:
+            f.write(f"#!/bin/sh\nexec {real_python} \"$@\"\n")
+        os.chmod(python_wrapper, 0o755)
+    return python_bin_dir
+
+
 def execute_bash_command(
     command: str,
     working_directory: str | None = None,
@@ -444,36 +899,52 @@ def execute_bash_command(
 
         os.makedirs(working_directory, exist_ok=True)
 
-        # Ensure 'python' resolves even if only 'python3' is on the PATH.
-        # Use a wrapper script (not a symlink) so the real executable's venv
-        # detection via pyvenv.cfg continues to work.
-        python_bin_dir = os.path.join(working_directory, ".bin")
-        os.makedirs(python_bin_dir, exist_ok=True)
-        python_wrapper = os.path.join(python_bin_dir, "python")
-        if not os.path.lexists(python_wrapper):
-            real_python = os.path.abspath(sys.executable)
-            with open(python_wrapper, "w") as f:
-                f.write(f"#!/bin/sh\nexec {real_python} \"$@\"\n")
-            os.chmod(python_wrapper, 0o755)
-
-        env = os.environ.copy()
-        env["PATH"] = f"{python_bin_dir}:{env.get('PATH', '')}"
+        env = None  # inherit os.environ unchanged
+        if not _python_on_path_is_current(os.environ.get("PATH", "")):
+            python_bin_dir = _ensure_python_wrapper(working_directory)
+            env = os.environ.copy()
+            env["PATH"] = f"{python_bin_dir}:{env.get('PATH', '')}"
 
-        result = subprocess.run(
+        # Only the tail of each stream is reported, so only the tail is kept:
+        # reader threads trim their buffers as output arrives instead of letting
+        # a chatty command accumulate everything in memory.
+        process = subprocess.Popen(
             command,
             shell=True,
             cwd=working_directory,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
             env=env,
+            start_new_session=True,
         )
+        stdout_tail = bytearray()
+        stderr_tail = bytearray()
+        # Keep 4 bytes per reported character: the most UTF-8 needs for one.
+        readers = [
+            threading.Thread(target=_drain_tail, args=(pipe, tail, max_chars * 4), daemon=True)
+            for pipe, tail, max_chars in (
+                (process.stdout, stdout_tail, _STDOUT_TAIL_CHARS),
+                (process.stderr, stderr_tail, _STDERR_TAIL_CHARS),
+            )
+        ]
+        for reader in readers:
+            reader.start()
+        try:
+            returncode = process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            # Kill the whole process group so children holding the pipes exit too.
+            os.killpg(process.pid, signal.SIGKILL)
+            process.wait()
+            raise
+        finally:
+            for reader in readers:
+                reader.join()
 
         return {
-            "success": result.returncode == 0,
-            "stdout": result.stdout[-4000:] if len(result.stdout) > 4000 else result.stdout,
-            "stderr": result.stderr[-2000:] if len(result.stderr) > 2000 else result.stderr,
-            "returncode": result.returncode,
+            "success": returncode == 0,
+            "stdout": stdout_tail.decode("utf-8", "replace")[-_STDOUT_TAIL_CHARS:],
+            "stderr": stderr_tail.decode("utf-8", "replace")[-_STDERR_TAIL_CHARS:],
+            "returncode": returncode,
             "working_directory": working_directory,
         }
 
@@ -537,7 +1008,7 @@ AGENT_TOOLS = [
                 "properties": {
                     "code": {
                         "type": "string",
-                        "description": "Python code to execute. If read_from_volume was used, source_doc_bytes/source_doc_base64/source_doc_filename/source_doc_path are available."
+                        "description": "Python code to execute. If read_from_volume was used, source_doc_bytes/source_doc_base64/source_doc_filename/source_doc_path are available. If read_many_from_volume was used, source_docs maps each filename to its bytes."
                     }
                 },
                 "required": ["code"]
@@ -595,6 +1066,24 @@ AGENT_TOOLS = [
             }
         }
     },
+    {
+        "type": "function",
+        "function": {
+            "name": "read_many_from_volume",
+            "description": "Read several files from the Unity Catalog Volume in one call. Each entry is resolved like read_from_volume. Prefer this over repeated read_from_volume calls when you need two or more files.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "filenames": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Bare filenames relative to the session folder, or full absolute paths to files in the volume."
+                    }
+                },
+                "required": ["filenames"]
+            }
+        }
+    },
     {
         "type": "function",
         "function": {
@@ -626,9 +1115,156 @@ AGENT_TOOLS = [
                 }
             }
         }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "batch",
+            "description": "Run several independent tool calls in one step. Independent calls run in parallel; results are returned in the same order as the invocations, each under a '### [n] tool_name' header.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "invocations": {
+                        "type": "array",
+                        "description": "Tool calls to run. Nested batch calls are not allowed.",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "tool_name": {"type": "string", "description": "Name of the tool to call"},
+                                "arguments": {"type": "object", "description": "Arguments for the tool"}
+                            },
+                            "required": ["tool_name"]
+                        }
+                    }
+                },
+                "required": ["invocations"]
+            }
+        }
     }
 ]
 
+# Upper bound on invocations from one batch call executed concurrently.
+_MAX_BATCH_WORKERS = 8
+
+
+# Tools that neither read nor write ToolContext or the session directory.
+# Consecutive calls to these can run concurrently; every other tool runs on its
+# own, in the order requested. copy_to_session is left out: it writes into the
+# session directory, so a list_volume_files next to it would race the copy.
+CONTEXT_FREE_TOOLS = frozenset({"list_skills", "load_skill", "list_volume_files"})
+
+
+def group_tool_calls(tool_names: list[str]) -> list[list[int]]:
+    """Split tool call indices into ordered groups that are safe to run concurrently.
+
+    Runs of context-free tools share a group; a tool that touches ToolContext
+    (e.g. read_from_volume followed by execute_python) always gets its own
+    group so its ordering relative to neighbouring calls is preserved.
+    """
+    groups: list[list[int]] = []
+    for index, tool_name in enumerate(tool_names):
+        if (
+            tool_name in CONTEXT_FREE_TOOLS
+            and groups
+            and tool_names[groups[-1][0]] in CONTEXT_FREE_TOOLS
+        ):
+            groups[-1].append(index)
+        else:
+            groups.append([index])
+    return groups
+
+
+def run_in_groups(
+    tool_names: list[str], run: Callable[[int], Any], max_workers: int
+) -> list[Any]:
+    """Call run(index) for every tool call, overlapping each group from group_tool_calls.
+
+    Results come back in call order. Each worker runs in a copy of the caller's
+    context, so MLflow spans opened there stay attached to the current trace.
+    """
+    results: list[Any] = [None] * len(tool_names)
+    for group in group_tool_calls(tool_names):
+        if len(group) == 1:
+            results[group[0]] = run(group[0])
+            continue
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(group))) as pool:
+            futures = {
+                index: pool.submit(contextvars.copy_context().run, run, index) for index in group
+            }
+            for index, future in futures.items():
+                results[index] = future.result()
+    return results
+
+
+def traced_tool_call(
+    config: AgentConfig,
+    tool_name: str,
+    tool_args: dict[str, Any],
+    tool_context: ToolContext,
+    tool_call_id: str | None = None,
+) -> str:
+    """Run handle_tool_call inside an MLflow span named tool:<tool_name>."""
+    with mlflow.start_span(name=f"tool:{tool_name}") as span:
+        span.set_attribute("tool.name", tool_name)
+        if tool_call_id is not None:
+            span.set_attribute("tool.call_id", tool_call_id)
+        span.set_inputs({"tool_name": tool_name, "tool_args": tool_args})
+        result = handle_tool_call(config, tool_name, tool_args, tool_context)
+        span.set_outputs({"result": result})
+    return result
+
+
+def run_batch(
+    config: AgentConfig,
+    invocations: list[dict[str, Any]],
+    tool_context: ToolContext,
+) -> list[dict[str, Any]]:
+    """Run the invocations of a batch tool call, overlapping independent ones.
+
+    Uses the same grouping as the graph's tool node, so calls that touch
+    ToolContext still run one at a time and in order. Each invocation gets its
+    own tool span, as a native tool call would. A failing invocation becomes an
+    error result instead of aborting the rest of the batch. Raises ValueError,
+    before running anything, if an invocation is itself a batch.
+    """
+    tool_names = [str(invocation.get("tool_name", "")) for invocation in invocations]
+    if "batch" in tool_names:
+        raise ValueError("nested batch calls are not allowed")
+
+    def run(index: int) -> str:
+        try:
+            return traced_tool_call(
+                config, tool_names[index], invocations[index].get("arguments") or {}, tool_context
+            )
+        except Exception as e:
+            return f"Error: {e}"
+
+    results = run_in_groups(tool_names, run, _MAX_BATCH_WORKERS)
+    return [
+        {"tool_name": tool_name, "result": result}
+        for tool_name, result in zip(tool_names, results)
+    ]
+
+
+def _format_batch_results(results: list[dict[str, Any]]) -> str:
+    """Render batch results as plain sections, so tool output reaches the model unescaped."""
+    return "\n\n".join(
+        f"### [{index}] {item['tool_name']}\n{item['result']}"
+        for index, item in enumerate(results, start=1)
+    )
+
+
+def _load_read_entry(entry: dict[str, Any]) -> bytes:
+    """Bytes for a read_from_volume/read_many_from_volume context entry."""
+    with open(entry["local_path"], "rb") as f:
+        return f.read()
+
+
+# Base64 alphabet plus line breaks, which encoders insert every 76 characters.
+_B64_TEXT_CHARS = frozenset(
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=\r\n"
+)
+
 
 def _looks_like_base64(s: str) -> bool:
     """Return True if the string is almost certainly base64-encoded binary data.
@@ -639,173 +1275,302 @@ def _looks_like_base64(s: str) -> bool:
     """
     if len(s) < 128:
         return False
-    sample = s[:200].replace("\n", "").replace("\r", "")
-    return all(c in "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=" for c in sample)
+    return _B64_TEXT_CHARS.issuperset(s[:200])
 
 
-def handle_tool_call(
-    config: AgentConfig,
-    tool_name: str,
-    tool_args: dict[str, Any],
-    tool_context: ToolContext | None = None,
+def _handle_list_skills(
+    config: AgentConfig, tool_args: dict[str, Any], tool_context: ToolContext
 ) -> str:
-    """Handle a tool call from the LLM."""
-    if tool_context is None:
-        tool_context = ToolContext()
+    """List available skills with their descriptions."""
+    result = list_skills(config)
+    if not result["skills"]:
+        return f"No skills found in: {', '.join(result['skill_directories'])}"
+    lines = [f"- {s['name']} ({s['id']}): {s['description']}" for s in result["skills"]]
+    return "Available skills:\n" + "\n".join(lines)
 
-    if tool_name == "list_skills":
-        result = list_skills(config)
-        if not result["skills"]:
-            return f"No skills found in: {', '.join(result['skill_directories'])}"
-        lines = [f"- {s['name']} ({s['id']}): {s['description']}" for s in result["skills"]]
-        return "Available skills:\n" + "\n".join(lines)
-
-    elif tool_name == "load_skill":
-        skill_name = tool_args.get("skill_name", "")
-        skill_lookup: dict[str, str] = {}
-        for skill_id in config.available_skills:
-            metadata = config.load_skill_metadata(skill_id)
-            skill_lookup[skill_id] = skill_id
-            skill_lookup[metadata.get("name", skill_id)] = skill_id
-
-        if skill_name in skill_lookup:
-            resolved_id = skill_lookup[skill_name]
-            skill_dir = config.get_skill_path(resolved_id)
-            content = load_skill_instructions(config, resolved_id)
-            return (
-                f"Loaded skill: {resolved_id}\n"
-                f"Skill directory: {skill_dir}\n"
-                f"Scripts path: {skill_dir}/scripts\n\n"
-                f"{content}"
-            )
 
-        return f"Skill '{skill_name}' not found. Available: {', '.join(config.available_skills)}"
+def _handle_load_skill(
+    config: AgentConfig, tool_args: dict[str, Any], tool_context: ToolContext
+) -> str:
+    """Return a skill's full instructions, resolving it by id or name."""
+    skill_name = tool_args.get("skill_name", "")
+    skill_lookup = skill_name_index(config)
+
+    if skill_name in skill_lookup:
+        resolved_id = skill_lookup[skill_name]
+        skill_dir = config.get_skill_path(resolved_id)
+        content = load_skill_instructions(config, resolved_id)
+        return (
+            f"Loaded skill: {resolved_id}\n"
+            f"Skill directory: {skill_dir}\n"
+            f"Scripts path: {skill_dir}/scripts\n\n"
+            f"{content}"
+        )
 
-    elif tool_name == "execute_python":
-        code = tool_args.get("code", "")
-        exec_context: dict[str, Any] = {}
-        if tool_context.last_read_from_volume.get("content_base64"):
-            try:
-                source_bytes = base64.b64decode(tool_context.last_read_from_volume["content_base64"])
-                exec_context.update({
-                    "source_doc_bytes": source_bytes,
-                    "source_doc_base64": tool_context.last_read_from_volume["content_base64"],
-                    "source_doc_filename": tool_context.last_read_from_volume.get("filename", ""),
-                    "source_doc_path": tool_context.last_read_from_volume.get("path", ""),
-                })
-            except Exception:
-                pass
+    return f"Skill '{skill_name}' not found. Available: {', '.join(config.available_skills)}"
 
-        result = execute_python_code(code, context=exec_context if exec_context else None)
-        if result["success"]:
-            output = "Code executed successfully."
-            if result["result"] is not None:
-                result_value = result["result"]
-                if isinstance(result_value, bytes):
-                    encoded = base64.b64encode(result_value).decode("utf-8")
-                    tool_context.last_execute_result["content"] = encoded
-                    output += f"\nResult: <{len(result_value)} bytes>. Use save_to_volume to save."
-                else:
-                    result_str = str(result_value)
-                    # Always stash so save_to_volume can access it if needed.
-                    tool_context.last_execute_result["content"] = result_str
-                    if _looks_like_base64(result_str):
-                        # Encoded binary (e.g. a processed document). Don't show
-                        # the raw base64 — it's useless tokens. Just signal to save.
-                        output += f"\nResult: <{len(result_str)} chars, base64-encoded binary>. Call save_to_volume to persist."
-                    elif len(result_str) > 8000:
-                        # Very long plain text — show a truncated preview.
-                        output += (
-                            f"\nResult ({len(result_str)} chars, showing first 8000):\n"
-                            f"{result_str[:8000]}\n...(truncated)"
-                        )
-                    else:
-                        output += f"\nResult:\n{result_str}"
-            return output
-        return f"Code execution failed: {result['error']}"
-
-    elif tool_name == "execute_bash":
-        command = tool_args.get("command", "")
-        timeout = tool_args.get("timeout", 120)
 
-        if tool_context.bash_working_directory is None:
-            tool_context.bash_working_directory = tempfile.mkdtemp(prefix="agent_bash_")
+def _handle_execute_python(
+    config: AgentConfig, tool_args: dict[str, Any], tool_context: ToolContext
+) -> str:
+    """Run Python with any previously read documents in scope."""
+    code = tool_args.get("code", "")
+    exec_context: dict[str, Any] = {}
+    lazy_context: dict[str, Callable[[], Any]] = {}
+    last_read = dict(tool_context.last_read_from_volume)
+    if last_read.get("local_path"):
+        # Documents are only read (and encoded) if the code looks the name up.
+        load_source = functools.cache(lambda: _load_read_entry(last_read))
+        exec_context.update({
+            "source_doc_filename": last_read.get("filename", ""),
+            "source_doc_path": last_read.get("path", ""),
+        })
+        lazy_context["source_doc_bytes"] = load_source
+        lazy_context["source_doc_base64"] = lambda: _b64encode(load_source()).decode("ascii")
+
+    read_many = dict(tool_context.last_read_many_from_volume)
+    if read_many:
+        lazy_context["source_docs"] = lambda: {
+            filename: _load_read_entry(entry) for filename, entry in read_many.items()
+        }
 
-        result = execute_bash_command(
-            command,
-            working_directory=tool_context.bash_working_directory,
-            timeout=timeout,
-        )
+    result = execute_python_code(
+        code,
+        context=exec_context if exec_context else None,
+        lazy_context=lazy_context,
+    )
+    if result["success"]:
+        output = "Code executed successfully."
+        if result["result"] is not None:
+            result_value = result["result"]
+            tool_context.last_execute_result.clear()
+            if isinstance(result_value, bytes):
+                output += f"\nResult: <{len(result_value)} bytes>."
+                if tool_context.run_directory is None:
+                    return output + " No run directory is set, so it cannot be saved."
+                # Spill the bytes to the run directory: ToolContext is checkpointed,
+                # and save_to_volume streams the file without a base64 round-trip.
+                fd, local_path = tempfile.mkstemp(
+                    prefix="agent_result_", suffix=".bin", dir=tool_context.run_directory
+                )
+                with os.fdopen(fd, "wb") as f:
+                    f.write(result_value)
+                tool_context.last_execute_result.update(
+                    {"local_path": local_path, "size_bytes": len(result_value)}
+                )
+                output += " Use save_to_volume to save."
+            else:
+                result_str = str(result_value)
+                # Always stash so save_to_volume can access it if needed.
+                tool_context.last_execute_result["content"] = result_str
+                if _looks_like_base64(result_str):
+                    # Encoded binary (e.g. a processed document). Don't show
+                    # the raw base64 — it's useless tokens. Just signal to save.
+                    output += f"\nResult: <{len(result_str)} chars, base64-encoded binary>. Call save_to_volume to persist."
+                elif len(result_str) > 8000:
+                    # Very long plain text — show a truncated preview.
+                    output += (
+                        f"\nResult ({len(result_str)} chars, showing first 8000):\n"
+                        f"{result_str[:8000]}\n...(truncated)"
+                    )
+                else:
+                    output += f"\nResult:\n{result_str}"
+        return output
+    return f"Code execution failed: {result['error']}"
 
-        tool_context.bash_working_directory = result.get(
-            "working_directory", tool_context.bash_working_directory
-        )
 
-        output_parts = []
+def _handle_execute_bash(
+    config: AgentConfig, tool_args: dict[str, Any], tool_context: ToolContext
+) -> str:
+    """Run a shell command in the context's persistent working directory."""
+    command = tool_args.get("command", "")
+    timeout = tool_args.get("timeout", 120)
+
+    if tool_context.bash_working_directory is None:
+        tool_context.bash_working_directory = tempfile.mkdtemp(prefix="agent_bash_")
+
+    result = execute_bash_command(
+        command,
+        working_directory=tool_context.bash_working_directory,
+        timeout=timeout,
+    )
+
+    tool_context.bash_working_directory = result.get(
+        "working_directory", tool_context.bash_working_directory
+    )
+
+    output_parts = []
+    if result["success"]:
+        output_parts.append("Command executed successfully.")
+    else:
+        output_parts.append(f"Command failed (exit code {result['returncode']}).")
+        if result.get("error"):
+            output_parts.append(f"Error: {result['error']}")
+
+    if result.get("stdout"):
+        output_parts.append(f"stdout:\n{result['stdout']}")
+    if result.get("stderr"):
+        output_parts.append(f"stderr:\n{result['stderr']}")
+
+    output_parts.append(f"Working directory: {result['working_directory']}")
+    return "\n".join(output_parts)
+
+
+def _handle_save_to_volume(
+    config: AgentConfig, tool_args: dict[str, Any], tool_context: ToolContext
+) -> str:
+    """Save explicit content, or the last execute_python result, to the volume."""
+    filename = tool_args.get("filename", "output.bin")
+    content_type = tool_args.get("content_type", "application/octet-stream")
+    content: str = tool_args.get("content_base64", "")
+    last_result = tool_context.last_execute_result
+    if not content and "local_path" in last_result:
+        # A bytes result, spilled to the run directory by execute_python; the
+        # file goes away with the directory.
+        local_path = last_result["local_path"]
+        last_result.clear()
+        try:
+            with open(local_path, "rb") as f:
+                result = save_to_uc_volume(config, filename, f, content_type)
+        except OSError as e:
+            result = {"success": False, "error": str(e), "path": None}
+    else:
+        if not content and "content" in last_result:
+            # A text result (base64 when it is a document).
+            content = last_result["content"]
+            last_result.clear()
+        result = save_to_uc_volume(config, filename, content, content_type)
+    if result["success"]:
+        return f"File saved: {result['path']}"
+    return f"Failed to save: {result['error']}"
+
+
+def _handle_read_from_volume(
+    config: AgentConfig, tool_args: dict[str, Any], tool_context: ToolContext
+) -> str:
+    """Fetch one file and expose it to execute_python as source_doc_*."""
+    filename = tool_args.get("filename", "")
+    if tool_context.run_directory is None:
+        return "Failed to read: no run directory is set for this request."
+    result = fetch_from_uc_volume(config, filename, tool_context.run_directory)
+    if result["success"]:
+        discard_fetched_file(tool_context.last_read_from_volume)
+        tool_context.last_read_from_volume.clear()
+        tool_context.last_read_from_volume.update({
+            "filename": filename,
+            "path": result["path"],
+            "local_path": result["local_path"],
+            "is_temporary": result["is_temporary"],
+            "size_bytes": result["size_bytes"],
+        })
+        return f"File read ({result['size_bytes']} bytes). Available as source_doc_bytes/source_doc_base64."
+    return f"Failed to read: {result['error']}"
+
+
+def _handle_read_many_from_volume(
+    config: AgentConfig, tool_args: dict[str, Any], tool_context: ToolContext
+) -> str:
+    """Fetch several files and expose them to execute_python as source_docs."""
+    filenames = tool_args.get("filenames") or []
+    if not isinstance(filenames, list) or not filenames:
+        return "Failed to read: 'filenames' must be a non-empty list."
+    if tool_context.run_directory is None:
+        return "Failed to read: no run directory is set for this request."
+    results = read_many_from_uc_volume(
+        config, [str(f) for f in filenames], tool_context.run_directory
+    )
+    for entry in tool_context.last_read_many_from_volume.values():
+        discard_fetched_file(entry)
+    tool_context.last_read_many_from_volume.clear()
+    lines = []
+    for filename, result in results.items():
         if result["success"]:
-            output_parts.append("Command executed successfully.")
+            tool_context.last_read_many_from_volume[filename] = {
+                "path": result["path"],
+                "local_path": result["local_path"],
+                "is_temporary": result["is_temporary"],
+                "size_bytes": result["size_bytes"],
+            }
+            lines.append(f"- {filename}: read ({result['size_bytes']} bytes)")
         else:
-            output_parts.append(f"Command failed (exit code {result['returncode']}).")
-            if result.get("error"):
-                output_parts.append(f"Error: {result['error']}")
-
-        if result.get("stdout"):
-            output_parts.append(f"stdout:\n{result['stdout']}")
-        if result.get("stderr"):
-            output_parts.append(f"stderr:\n{result['stderr']}")
-
-        output_parts.append(f"Working directory: {result['working_directory']}")
-        return "\n".join(output_parts)
-
-    elif tool_name == "save_to_volume":
-        content = tool_args.get("content_base64", "")
-        if not content and tool_context.last_execute_result.get("content"):
-            content = tool_context.last_execute_result["content"]
-            tool_context.last_execute_result.clear()
+            lines.append(f"- {filename}: failed ({result['error']})")
+    read_count = len(tool_context.last_read_many_from_volume)
+    return (
+        f"Read {read_count} of {len(results)} file(s). Available in execute_python as source_docs[filename].\n"
+        + "\n".join(lines)
+    )
 
-        result = save_to_uc_volume(
-            config,
-            tool_args.get("filename", "output.bin"),
-            content,
-            tool_args.get("content_type", "application/octet-stream")
-        )
-        if result["success"]:
-            return f"File saved: {result['path']}"
-        return f"Failed to save: {result['error']}"
 
-    elif tool_name == "read_from_volume":
-        result = read_from_uc_volume(config, tool_args.get("filename", ""), return_base64=True)
-        if result["success"]:
-            tool_context.last_read_from_volume.clear()
-            tool_context.last_read_from_volume.update({
-                "filename": tool_args.get("filename", ""),
-                "path": result.get("path", ""),
-                "content_base64": result.get("content", ""),
-                "size_bytes": result.get("size_bytes", 0),
-            })
-            return f"File read ({result['size_bytes']} bytes). Available as source_doc_bytes/source_doc_base64."
-        return f"Failed to read: {result['error']}"
-
-    elif tool_name == "copy_to_session":
-        result = copy_file_to_current_session(
-            config,
-            source_path=tool_args.get("source_path"),
-            source_session_id=tool_args.get("source_session_id"),
-            filename=tool_args.get("filename"),
-            target_filename=tool_args.get("target_filename"),
-        )
-        if result["success"]:
-            return f"Copied: {result['target_path']}"
-        return f"Failed to copy: {result['error']}"
+def _handle_copy_to_session(
+    config: AgentConfig, tool_args: dict[str, Any], tool_context: ToolContext
+) -> str:
+    """Copy a file from another session into the current one."""
+    result = copy_file_to_current_session(
+        config,
+        source_path=tool_args.get("source_path"),
+        source_session_id=tool_args.get("source_session_id"),
+        filename=tool_args.get("filename"),
+        target_filename=tool_args.get("target_filename"),
+    )
+    if result["success"]:
+        return f"Copied: {result['target_path']}"
+    return f"Failed to copy: {result['error']}"
+
+
+def _handle_list_volume_files(
+    config: AgentConfig, tool_args: dict[str, Any], tool_context: ToolContext
+) -> str:
+    """List files under a volume directory."""
+    result = list_uc_volume_files(config, path=tool_args.get("path"))
+    if result["success"]:
+        if not result["files"]:
+            return f"No files in {result['path']}"
+        # Show the full path so the agent can pass it directly to read_from_volume.
+        file_list = "\n".join([f"- {f['path']} ({f['size_bytes']} bytes)" for f in result["files"]])
+        return f"Files in {result['path']} ({result['count']} total):\n{file_list}"
+    return f"Failed to list: {result['error']}"
+
+
+def _handle_batch(
+    config: AgentConfig, tool_args: dict[str, Any], tool_context: ToolContext
+) -> str:
+    """Run a batch of independent tool calls."""
+    invocations = tool_args.get("invocations") or []
+    if not isinstance(invocations, list) or not all(isinstance(i, dict) for i in invocations):
+        return "Invalid batch: 'invocations' must be a list of {tool_name, arguments} objects."
+    try:
+        results = run_batch(config, invocations, tool_context)
+    except ValueError as e:
+        return f"Invalid batch: {e}."
+    return _format_batch_results(results)
+
+
+# Tool name -> handler. Every tool advertised in AGENT_TOOLS has an entry.
+_TOOL_HANDLERS: dict[str, Callable[[AgentConfig, dict[str, Any], ToolContext], str]] = {
+    "list_skills": _handle_list_skills,
+    "load_skill": _handle_load_skill,
+    "execute_python": _handle_execute_python,
+    "execute_bash": _handle_execute_bash,
+    "save_to_volume": _handle_save_to_volume,
+    "read_from_volume": _handle_read_from_volume,
+    "read_many_from_volume": _handle_read_many_from_volume,
+    "copy_to_session": _handle_copy_to_session,
+    "list_volume_files": _handle_list_volume_files,
+    "batch": _handle_batch,
+}
 
-    elif tool_name == "list_volume_files":
-        result = list_uc_volume_files(config, path=tool_args.get("path"))
-        if result["success"]:
-            if not result["files"]:
-                return f"No files in {result['path']}"
-            # Show the full path so the agent can pass it directly to read_from_volume.
-            file_list = "\n".join([f"- {f['path']} ({f['size_bytes']} bytes)" for f in result["files"]])
-            return f"Files in {result['path']} ({result['count']} total):\n{file_list}"
-        return f"Failed to list: {result['error']}"
-
-    return f"Unknown tool: {tool_name}"
+
+def handle_tool_call(
+    config: AgentConfig,
+    tool_name: str,
+    tool_args: dict[str, Any],
+    tool_context: ToolContext | None = None,
+) -> str:
+    """Handle a tool call from the LLM."""
+    if tool_context is None:
+        tool_context = ToolContext()
+
+    handler = _TOOL_HANDLERS.get(tool_name)
+    if handler is None:
+        return f"Unknown tool: {tool_name}"
+    return handler(config, tool_args, tool_context)
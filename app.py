@@ -15,6 +15,7 @@ from mlflow.types.responses import (
 )
 
 from agent import AgentConfig, DocumentResponsesAgent
+from agent.tools import skill_name_index
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +32,9 @@ logger.info(
     _config.session_output_path,
 )
 logger.info("Available skills: %s", _config.available_skills)
+# Parse every SKILL.md frontmatter now so the first list_skills/load_skill call
+# only pays for the mtime check that keeps the index fresh.
+skill_name_index(_config)
 
 
 @invoke()
@@ -2,6 +2,12 @@ import json
 import sys
 import mlflow
 from mlflow.tracking import MlflowClient
+
+try:
+    import orjson
+except ImportError:  # optional: only speeds up dumping large traces
+    orjson = None
+
 mlflow.set_tracking_uri("databricks://FEVM")
 
 
@@ -14,4 +20,10 @@ trace_id = args[0]
 
 client = MlflowClient()
 trace = client.get_trace(trace_id)
-print(json.dumps(trace.to_dict(), indent=2))
\ No newline at end of file
+trace_dict = trace.to_dict()
+if orjson is not None:
+    sys.stdout.buffer.write(
+        orjson.dumps(trace_dict, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    )
+else:
+    print(json.dumps(trace_dict, indent=2))
\ No newline at end of file
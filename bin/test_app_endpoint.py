@@ -6,15 +6,21 @@ Usage:
   Interactive:   uv run bin/test_app_endpoint.py
 """
 
+import http.client
+import io
 import json
 import subprocess
 import sys
 import urllib.error
-import urllib.request
+import urllib.parse
 import uuid
 
 APP_URL = "https://docx-skills-agent-1602460480284688.aws.databricksapps.com/invocations"
 PROFILE = "FEVM"
+_APP_URL_PARTS = urllib.parse.urlsplit(APP_URL)
+
+# Reused across turns so follow-up prompts skip the TCP + TLS handshake.
+_connection: http.client.HTTPSConnection | None = None
 
 
 def _get_access_token() -> str:
@@ -38,18 +44,40 @@ def _send(prompt: str, token: str, conversation_id: str) -> dict:
         "input": [{"role": "user", "content": prompt}],
         "custom_inputs": {"conversation_id": conversation_id},
     }
-    request = urllib.request.Request(
-        APP_URL,
-        data=json.dumps(payload).encode("utf-8"),
-        headers={
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-        },
-        method="POST",
-    )
-    with urllib.request.urlopen(request, timeout=300) as response:
-        return json.loads(response.read().decode("utf-8", errors="replace"))
+    body = json.dumps(payload).encode("utf-8")
+    headers = {
+        "Authorization": f"Bearer {token}",
+        "Content-Type": "application/json",
+        "Accept": "application/json",
+    }
+    status, reason, response_headers, data = _post(body, headers)
+    if status >= 400:
+        raise urllib.error.HTTPError(APP_URL, status, reason, response_headers, io.BytesIO(data))
+    return json.loads(data.decode("utf-8", errors="replace"))
+
+
+def _post(body: bytes, headers: dict[str, str]) -> tuple[int, str, http.client.HTTPMessage, bytes]:
+    """POST to APP_URL over the shared keep-alive connection.
+
+    A reused connection the server has since closed is reopened and the request
+    sent once more; other connection failures surface as URLError.
+    """
+    global _connection
+    reused = _connection is not None
+    if _connection is None:
+        _connection = http.client.HTTPSConnection(_APP_URL_PARTS.netloc, timeout=300)
+    try:
+        _connection.request("POST", _APP_URL_PARTS.path, body=body, headers=headers)
+        response = _connection.getresponse()
+        return response.status, response.reason, response.headers, response.read()
+    except (http.client.HTTPException, OSError) as exc:
+        _connection.close()
+        _connection = None
+        if reused and isinstance(
+            exc, (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+        ):
+            return _post(body, headers)
+        raise urllib.error.URLError(exc) from exc
 
 
 def _extract_text(body: dict) -> str:
@@ -0,0 +1,192 @@
+"""Tests for the DocumentAgent tool nodes."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.runnables import RunnableLambda
+
+from agent import tools
+from agent.config import AgentConfig
+from agent.graph import DocumentAgent
+
+# A turn mixing context-free tools with tools that read and write ToolContext.
+_TOOL_CALLS = [
+    ("list_skills", {}),
+    ("load_skill", {"skill_name": "alpha"}),
+    ("read_from_volume", {"filename": "doc.txt"}),
+    ("list_volume_files", {}),
+    ("load_skill", {"skill_name": "beta"}),
+    ("execute_python", {"code": "result = 1"}),
+    ("list_skills", {}),
+]
+
+
+@pytest.fixture
+def agent(tmp_path: Path) -> DocumentAgent:
+    return DocumentAgent(
+        AgentConfig(
+            skills_directory=tmp_path / "skills",
+            output_mode="local",
+            local_output_dir=str(tmp_path / "output"),
+            session_id="test",
+        )
+    )
+
+
+@pytest.fixture
+def fake_handlers(monkeypatch):
+    """Replace the tool handlers with slow fakes that record what they saw."""
+    seen_threads: dict[int, int] = {}
+
+    def context_free(label: str):
+        def handler(config, tool_args, tool_context):
+            # Earlier calls in a concurrent group finish last.
+            time.sleep(0.05 if label == "first" else 0)
+            return f"{label}:{tool_args}"
+
+        return handler
+
+    def read_from_volume(config, tool_args, tool_context):
+        time.sleep(0.02)
+        seen_threads["read"] = threading.get_ident()
+        tool_context.last_read_from_volume = {"filename": tool_args["filename"]}
+        return f"read {tool_args['filename']}"
+
+    def execute_python(config, tool_args, tool_context):
+        seen_threads["execute"] = threading.get_ident()
+        source = tool_context.last_read_from_volume.get("filename")
+        tool_context.last_execute_result = {"content": f"ran on {source}"}
+        return f"ran on {source}"
+
+    monkeypatch.setitem(tools._TOOL_HANDLERS, "list_skills", context_free("first"))
+    monkeypatch.setitem(tools._TOOL_HANDLERS, "load_skill", context_free("later"))
+    monkeypatch.setitem(tools._TOOL_HANDLERS, "list_volume_files", context_free("first"))
+    monkeypatch.setitem(tools._TOOL_HANDLERS, "read_from_volume", read_from_volume)
+    monkeypatch.setitem(tools._TOOL_HANDLERS, "execute_python", execute_python)
+    return seen_threads
+
+
+def _state(tool_calls=_TOOL_CALLS) -> dict:
+    message = AIMessage(
+        content="",
+        tool_calls=[
+            {"name": name, "args": args, "id": f"call_{index}"}
+            for index, (name, args) in enumerate(tool_calls)
+        ],
+    )
+    return {"messages": [message], "session_id": "test", "tool_context": {}}
+
+
+def _run(agent: DocumentAgent, state: dict, use_async: bool) -> dict:
+    if use_async:
+        return asyncio.run(agent.tool_node_async(state))
+    return agent.tool_node(state)
+
+
+@pytest.mark.parametrize("use_async", [False, True], ids=["sync", "async"])
+def test_tool_node_pairs_messages_with_calls_in_call_order(agent, fake_handlers, use_async):
+    update = _run(agent, _state(), use_async)
+
+    messages = update["messages"]
+    assert all(isinstance(message, ToolMessage) for message in messages)
+    assert [message.tool_call_id for message in messages] == [
+        f"call_{index}" for index in range(len(_TOOL_CALLS))
+    ]
+    assert [message.content for message in messages] == [
+        "first:{}",
+        "later:{'skill_name': 'alpha'}",
+        "read doc.txt",
+        "first:{}",
+        "later:{'skill_name': 'beta'}",
+        "ran on doc.txt",
+        "first:{}",
+    ]
+
+
+@pytest.mark.parametrize("use_async", [False, True], ids=["sync", "async"])
+def test_tool_node_keeps_context_mutations_across_threads(agent, fake_handlers, use_async):
+    update = _run(agent, _state(), use_async)
+
+    tool_context = update["tool_context"]
+    assert tool_context["last_read_from_volume"] == {"filename": "doc.txt"}
+    assert tool_context["last_execute_result"] == {"content": "ran on doc.txt"}
+    if use_async:
+        # Each call ran on a worker thread, yet both writes reached the state.
+        assert fake_handlers["read"] != threading.get_ident()
+
+
+@pytest.mark.parametrize("use_async", [False, True], ids=["sync", "async"])
+def test_tool_node_leaves_context_out_for_context_free_turns(agent, fake_handlers, use_async):
+    update = _run(agent, _state([("list_skills", {}), ("load_skill", {"skill_name": "a"})]), use_async)
+
+    assert [message.tool_call_id for message in update["messages"]] == ["call_0", "call_1"]
+    assert "tool_context" not in update
+
+
+def _scripted_llm(*responses: AIMessage) -> RunnableLambda:
+    """Stand-in for llm_with_tools that answers each call with the next response."""
+    replies = iter(responses)
+    return RunnableLambda(lambda messages: next(replies))
+
+
+def test_run_directory_is_removed_and_cleared_from_the_checkpoint(agent, tmp_path):
+    source = tmp_path / "doc.txt"
+    source.write_bytes(b"hello")
+    agent.__dict__["llm_with_tools"] = _scripted_llm(
+        AIMessage(
+            content="",
+            tool_calls=[
+                {"name": "read_from_volume", "args": {"filename": str(source)}, "id": "call_0"},
+                {"name": "execute_python", "args": {"code": "result = source_doc_bytes.decode()"}, "id": "call_1"},
+            ],
+        ),
+        AIMessage(content="done"),
+    )
+
+    final_state = agent.invoke([HumanMessage(content="read it")], session_id="thread")
+
+    run_directory = final_state["tool_context"]["run_directory"]
+    assert final_state["messages"][-2].content.endswith("Result:\nhello")
+    assert not os.path.exists(run_directory)
+    checkpoint = agent.build().get_state({"configurable": {"thread_id": "thread"}})
+    assert checkpoint.values["tool_context"] == {}
+    assert checkpoint.next == ()
+
+
+def test_astream_clears_the_run_directory_from_the_checkpoint(agent, tmp_path, monkeypatch):
+    run_directories = []
+    mkdtemp = tempfile.mkdtemp
+
+    def recording_mkdtemp(**kwargs):
+        run_directories.append(mkdtemp(**kwargs))
+        return run_directories[-1]
+
+    monkeypatch.setattr(tempfile, "mkdtemp", recording_mkdtemp)
+    source = tmp_path / "doc.txt"
+    source.write_bytes(b"hello")
+    agent.__dict__["llm_with_tools"] = _scripted_llm(
+        AIMessage(
+            content="",
+            tool_calls=[{"name": "read_from_volume", "args": {"filename": str(source)}, "id": "call_0"}],
+        ),
+        AIMessage(content="done"),
+    )
+
+    async def consume():
+        return [item async for item in agent.astream([HumanMessage(content="read it")], session_id="thread")]
+
+    asyncio.run(consume())
+
+    checkpoint = agent.build().get_state({"configurable": {"thread_id": "thread"}})
+    assert checkpoint.values["messages"][-1].content == "done"
+    assert checkpoint.values["tool_context"] == {}
+    assert len(run_directories) == 1
+    assert not os.path.exists(run_directories[0])
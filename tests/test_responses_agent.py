@@ -0,0 +1,10 @@
+"""Tests for DocumentResponsesAgent."""
+
+from __future__ import annotations
+
+from agent.responses_agent import DocumentResponsesAgent
+
+
+def test_session_id_from_thread_keeps_the_md5_derivation():
+    # Session output folders are named after this id; changing it orphans them.
+    assert DocumentResponsesAgent._session_id_from_thread("thread-123") == "403fe3e4"
@@ -0,0 +1,628 @@
+"""Tests for the helpers in agent.tools."""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from agent import tools
+from agent.config import AgentConfig
+
+
+def _write_skill(skills_dir: Path, skill_id: str, name: str, description: str) -> Path:
+    skill_md = skills_dir / skill_id / "SKILL.md"
+    skill_md.parent.mkdir(parents=True, exist_ok=True)
+    skill_md.write_text(f"---\nname: {name}\ndescription: {description}\n---\n\nBody of {name}.\n")
+    return skill_md
+
+
+def _bump_mtime(path: Path) -> None:
+    """Move a path's mtime forward so mtime-keyed caches see a change immediately."""
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def skill_config(tmp_path: Path) -> AgentConfig:
+    skills_dir = tmp_path / "skills"
+    _write_skill(skills_dir, "alpha", "Alpha", "first")
+    return AgentConfig(
+        skills_directory=skills_dir,
+        output_mode="local",
+        local_output_dir=str(tmp_path / "output"),
+        session_id="test",
+    )
+
+
+# -----------------------------------------------------------------------------
+# _safe_relative_path
+# -----------------------------------------------------------------------------
+
+@pytest.mark.parametrize(
+    "path_value",
+    ["", "   ", ".", "./", "/etc/passwd", "..", "../x", "a/../../x", "a/..", "a/../b"],
+)
+def test_safe_relative_path_rejects_unsafe_paths(path_value):
+    assert tools._safe_relative_path(path_value) is None
+
+
+@pytest.mark.parametrize(
+    ("path_value", "expected"),
+    [
+        ("report.docx", "report.docx"),
+        ("  report.docx  ", "report.docx"),
+        ("./out/report.docx", "out/report.docx"),
+        ("out//nested/./report.docx", "out/nested/report.docx"),
+        ("..hidden", "..hidden"),
+        ("a/b..c", "a/b..c"),
+    ],
+)
+def test_safe_relative_path_normalizes_safe_paths(path_value, expected):
+    assert tools._safe_relative_path(path_value) == expected
+
+
+# -----------------------------------------------------------------------------
+# _b64decode_strict
+# -----------------------------------------------------------------------------
+
+def test_b64decode_strict_round_trips():
+    payload = bytes(range(256)) * 4
+    assert tools._b64decode_strict(base64.b64encode(payload).decode("ascii")) == payload
+    assert tools._b64decode_strict("") == b""
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        "aGVsbG8",  # missing padding
+        '{"text": "hello"}',  # JSON sent by mistake
+        "aGVs bG8=",  # whitespace
+        "aGVs\nbG8=",  # line break
+        "A" * 100 + "!!!!",  # bad character after the checked prefix
+    ],
+)
+def test_b64decode_strict_rejects_malformed_input(data):
+    with pytest.raises((binascii.Error, ValueError)):
+        tools._b64decode_strict(data)
+
+
+@pytest.mark.parametrize(
+    ("data", "reason"),
+    [
+        ("A" * 1001, "length is not a multiple of 4"),
+        ("{" + "A" * 1023, "non-base64 character in the first 64 characters"),
+    ],
+)
+def test_b64decode_strict_fast_rejects_before_decoding(data, reason):
+    with pytest.raises(binascii.Error, match=reason):
+        tools._b64decode_strict(data)
+
+
+@pytest.fixture(params=["pybase64", "stdlib"])
+def b64_backend(request, monkeypatch):
+    """Run a test once with pybase64 and once with the stdlib fallback."""
+    if request.param == "pybase64":
+        monkeypatch.setattr(tools, "pybase64", pytest.importorskip("pybase64"))
+    else:
+        monkeypatch.setattr(tools, "pybase64", None)
+    return request.param
+
+
+def test_b64decode_strict_round_trips_with_either_backend(b64_backend):
+    payload = bytes(range(256)) * 4
+    assert tools._b64decode_strict(base64.b64encode(payload).decode("ascii")) == payload
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        "A" * 100 + "!!!!",  # bad character past the fast-reject prefix
+        "A" * 100 + "-_-_",  # urlsafe alphabet
+        "aGVs=bG8",  # padding in the middle
+        "AA=A",  # data after padding
+        "====",  # padding only
+    ],
+)
+def test_b64decode_strict_backends_reject_the_same_input(b64_backend, data):
+    with pytest.raises((binascii.Error, ValueError)):
+        tools._b64decode_strict(data)
+
+
+def test_save_to_volume_reports_invalid_base64(skill_config):
+    result = tools.save_to_uc_volume(skill_config, "out.bin", "not base64!")
+    assert result["success"] is False
+    assert result["error"].startswith("Invalid content_base64 payload")
+
+
+# -----------------------------------------------------------------------------
+# group_tool_calls / run_in_groups
+# -----------------------------------------------------------------------------
+
+def test_group_tool_calls_keeps_context_tools_alone_and_in_order():
+    names = [
+        "list_skills",
+        "load_skill",
+        "read_from_volume",
+        "execute_python",
+        "list_volume_files",
+        "copy_to_session",
+        "list_skills",
+        "load_skill",
+    ]
+    assert tools.group_tool_calls(names) == [[0, 1], [2], [3], [4], [5], [6, 7]]
+
+
+def test_group_tool_calls_covers_every_index_once():
+    names = ["load_skill", "execute_bash", "list_skills", "list_volume_files", "save_to_volume"]
+    groups = tools.group_tool_calls(names)
+    assert [index for group in groups for index in group] == list(range(len(names)))
+
+
+def test_run_in_groups_returns_results_in_call_order():
+    names = ["list_skills", "load_skill", "execute_python", "list_volume_files", "load_skill"]
+
+    def run(index: int) -> int:
+        # Earlier calls in a concurrent group finish last.
+        time.sleep(0.02 * (len(names) - index))
+        return index
+
+    assert tools.run_in_groups(names, run, max_workers=4) == list(range(len(names)))
+
+
+# -----------------------------------------------------------------------------
+# batch
+# -----------------------------------------------------------------------------
+
+def test_batch_renders_one_section_per_invocation_in_order(skill_config):
+    output = tools.handle_tool_call(
+        skill_config,
+        "batch",
+        {
+            "invocations": [
+                {"tool_name": "list_skills", "arguments": {}},
+                {"tool_name": "no_such_tool", "arguments": {}},
+                {"tool_name": "load_skill", "arguments": {"skill_name": "alpha"}},
+            ]
+        },
+    )
+
+    sections = output.split("\n\n### ")
+    assert [section.split("\n", 1)[0].lstrip("# ") for section in sections] == [
+        "[1] list_skills",
+        "[2] no_such_tool",
+        "[3] load_skill",
+    ]
+    assert "Alpha" in sections[0]
+    assert sections[1] == "[2] no_such_tool\nUnknown tool: no_such_tool"
+    assert "Body of Alpha." in sections[2]
+
+
+def test_batch_rejects_nested_batches_before_running_anything(skill_config, monkeypatch):
+    calls = []
+    monkeypatch.setitem(tools._TOOL_HANDLERS, "list_skills", lambda *args: calls.append(args) or "")
+
+    output = tools.handle_tool_call(
+        skill_config,
+        "batch",
+        {
+            "invocations": [
+                {"tool_name": "list_skills", "arguments": {}},
+                {"tool_name": "batch", "arguments": {"invocations": []}},
+            ]
+        },
+    )
+
+    assert output == "Invalid batch: nested batch calls are not allowed."
+    assert calls == []
+
+
+def test_batch_reports_a_failing_invocation_in_its_own_section(skill_config, monkeypatch):
+    def fail(config, tool_args, tool_context):
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(tools._TOOL_HANDLERS, "list_volume_files", fail)
+    output = tools.handle_tool_call(
+        skill_config,
+        "batch",
+        {
+            "invocations": [
+                {"tool_name": "list_volume_files", "arguments": {}},
+                {"tool_name": "no_such_tool"},
+            ]
+        },
+    )
+
+    assert output == (
+        "### [1] list_volume_files\nError: boom\n\n### [2] no_such_tool\nUnknown tool: no_such_tool"
+    )
+
+
+@pytest.mark.parametrize("invocations", ["list_skills", [["list_skills"]], [{"tool_name": "x"}, 1]])
+def test_batch_rejects_malformed_invocations(skill_config, invocations):
+    output = tools.handle_tool_call(skill_config, "batch", {"invocations": invocations})
+    assert output.startswith("Invalid batch: 'invocations' must be a list")
+
+
+# -----------------------------------------------------------------------------
+# execute_bash_command
+# -----------------------------------------------------------------------------
+
+def test_execute_bash_command_times_out_and_kills_children(tmp_path):
+    started = time.monotonic()
+    # The background child keeps the pipes open; it must be killed with the shell.
+    result = tools.execute_bash_command("sleep 30 & sleep 30", str(tmp_path), timeout=1)
+    assert time.monotonic() - started < 10
+    assert result["success"] is False
+    assert result["error"] == "Command timed out after 1s"
+    assert result["returncode"] == -1
+
+
+def test_execute_bash_command_keeps_only_the_output_tail(tmp_path):
+    command = (
+        "python -c \"import sys; "
+        "sys.stdout.write('a' * 100000 + 'END'); sys.stderr.write('b' * 50000 + 'ERR')\""
+    )
+    result = tools.execute_bash_command(command, str(tmp_path))
+    assert result["success"] is True
+    assert len(result["stdout"]) == tools._STDOUT_TAIL_CHARS
+    assert result["stdout"].endswith("END")
+    assert len(result["stderr"]) == tools._STDERR_TAIL_CHARS
+    assert result["stderr"].endswith("ERR")
+
+
+def test_execute_bash_command_reports_failures(tmp_path):
+    result = tools.execute_bash_command("echo out; echo err >&2; exit 3", str(tmp_path))
+    assert result["success"] is False
+    assert result["returncode"] == 3
+    assert result["stdout"] == "out\n"
+    assert result["stderr"] == "err\n"
+
+
+def test_execute_bash_command_recreates_a_deleted_python_wrapper(tmp_path, monkeypatch):
+    # Pretend 'python' on the PATH is some other interpreter, so the wrapper is used.
+    monkeypatch.setattr(tools, "_python_on_path_is_current", lambda path_env: False)
+    command = "python -c 'import sys; print(sys.executable)'"
+
+    first = tools.execute_bash_command(command, str(tmp_path))
+    os.remove(tmp_path / ".bin" / "python")
+    second = tools.execute_bash_command(command, str(tmp_path))
+
+    assert first["success"] is True
+    assert second["success"] is True
+    assert (tmp_path / ".bin" / "python").exists()
+    assert first["stdout"] == second["stdout"]
+
+
+# -----------------------------------------------------------------------------
+# Skill caches
+# -----------------------------------------------------------------------------
+
+def test_added_skill_is_discovered(skill_config):
+    assert skill_config.available_skills == ["alpha"]
+
+    _write_skill(skill_config.skills_directory, "beta", "Beta", "second")
+    _bump_mtime(skill_config.skills_directory)
+
+    assert skill_config.available_skills == ["alpha", "beta"]
+
+
+def test_removed_skill_disappears(skill_config):
+    _write_skill(skill_config.skills_directory, "beta", "Beta", "second")
+    _bump_mtime(skill_config.skills_directory)
+    assert skill_config.available_skills == ["alpha", "beta"]
+
+    (skill_config.skills_directory / "beta" / "SKILL.md").unlink()
+    (skill_config.skills_directory / "beta").rmdir()
+    _bump_mtime(skill_config.skills_directory)
+
+    assert skill_config.available_skills == ["alpha"]
+
+
+def test_list_skills_picks_up_added_and_edited_skills(skill_config):
+    assert [skill["name"] for skill in tools.list_skills(skill_config)["skills"]] == ["Alpha"]
+
+    _write_skill(skill_config.skills_directory, "beta", "Beta", "second")
+    _bump_mtime(skill_config.skills_directory)
+    assert [skill["name"] for skill in tools.list_skills(skill_config)["skills"]] == ["Alpha", "Beta"]
+
+    _bump_mtime(_write_skill(skill_config.skills_directory, "alpha", "Alpha2", "edited"))
+    assert [skill["name"] for skill in tools.list_skills(skill_config)["skills"]] == ["Alpha2", "Beta"]
+
+
+def test_skill_name_index_follows_metadata_changes(skill_config):
+    assert tools.skill_name_index(skill_config)["Alpha"] == "alpha"
+
+    _write_skill(skill_config.skills_directory, "beta", "Beta", "second")
+    _bump_mtime(skill_config.skills_directory)
+    _bump_mtime(_write_skill(skill_config.skills_directory, "alpha", "Alpha2", "edited"))
+
+    index = tools.skill_name_index(skill_config)
+    assert index["Alpha2"] == "alpha"
+    assert index["Beta"] == "beta"
+    assert "Alpha" not in index
+
+
+def test_skill_context_is_rerendered_when_a_skill_changes(skill_config):
+    assert "**Alpha**: first" in tools.build_skill_context(skill_config)
+
+    _write_skill(skill_config.skills_directory, "beta", "Beta", "second")
+    _bump_mtime(skill_config.skills_directory)
+    assert "**Beta**: second" in tools.build_skill_context(skill_config)
+
+    _bump_mtime(_write_skill(skill_config.skills_directory, "alpha", "Alpha2", "edited"))
+    skill_context = tools.build_skill_context(skill_config)
+    assert "**Alpha2**: edited" in skill_context
+    assert "**Alpha**: first" not in skill_context
+
+    (skill_config.skills_directory / "beta" / "SKILL.md").unlink()
+    (skill_config.skills_directory / "beta").rmdir()
+    _bump_mtime(skill_config.skills_directory)
+    assert "Beta" not in tools.build_skill_context(skill_config)
+
+
+def test_edited_skill_body_is_reloaded(skill_config):
+    assert "Body of Alpha." in tools.load_skill_instructions(skill_config, "alpha")
+
+    skill_md = skill_config.skills_directory / "alpha" / "SKILL.md"
+    skill_md.write_text("---\nname: Alpha\ndescription: first\n---\n\nNew body.\n")
+    _bump_mtime(skill_md)
+
+    assert tools.load_skill_instructions(skill_config, "alpha") == "New body."
+
+
+# -----------------------------------------------------------------------------
+# read_from_volume / execute_python
+# -----------------------------------------------------------------------------
+
+def test_read_from_volume_snapshots_the_file_into_the_run_directory(skill_config, tmp_path):
+    session_dir = Path(skill_config.session_output_path)
+    session_dir.mkdir(parents=True)
+    (session_dir / "doc.txt").write_bytes(b"v1")
+    tool_context = tools.ToolContext()
+    tool_context.run_directory = str(tmp_path / "fetched")
+    os.mkdir(tool_context.run_directory)
+
+    tools.handle_tool_call(skill_config, "read_from_volume", {"filename": "doc.txt"}, tool_context)
+    (session_dir / "doc.txt").write_bytes(b"v2")
+    output = tools.handle_tool_call(
+        skill_config, "execute_python", {"code": "result = source_doc_bytes.decode()"}, tool_context
+    )
+
+    assert output.endswith("Result:\nv1")
+    assert os.listdir(tool_context.run_directory) == [
+        os.path.basename(tool_context.last_read_from_volume["local_path"])
+    ]
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "result = source_doc_base64",
+        "result = globals().get('source_doc_' + 'base64')",
+        "def f():\n    return source_doc_base64\nresult = f()",
+    ],
+)
+def test_source_doc_base64_resolves_however_it_is_looked_up(skill_config, tmp_path, code):
+    source = tmp_path / "doc.bin"
+    source.write_bytes(b"\x00\xffdata")
+    tool_context = tools.ToolContext()
+    tool_context.run_directory = str(tmp_path)
+
+    tools.handle_tool_call(skill_config, "read_from_volume", {"filename": str(source)}, tool_context)
+    output = tools.handle_tool_call(skill_config, "execute_python", {"code": code}, tool_context)
+
+    assert output.endswith("Result:\n" + base64.b64encode(b"\x00\xffdata").decode("ascii"))
+
+
+def test_reads_need_a_run_directory(skill_config, tmp_path):
+    source = tmp_path / "doc.txt"
+    source.write_bytes(b"v1")
+    tool_context = tools.ToolContext()
+
+    for tool_name, tool_args in [
+        ("read_from_volume", {"filename": str(source)}),
+        ("read_many_from_volume", {"filenames": [str(source)]}),
+    ]:
+        output = tools.handle_tool_call(skill_config, tool_name, tool_args, tool_context)
+        assert output == "Failed to read: no run directory is set for this request."
+    assert not tool_context.last_read_from_volume
+    assert not tool_context.last_read_many_from_volume
+
+
+def test_execute_python_only_loads_documents_the_code_uses(skill_config, tmp_path):
+    source = tmp_path / "doc.txt"
+    source.write_bytes(b"v1")
+    tool_context = tools.ToolContext()
+    tool_context.run_directory = str(tmp_path)
+    tools.handle_tool_call(skill_config, "read_from_volume", {"filename": str(source)}, tool_context)
+    tools.handle_tool_call(
+        skill_config, "read_many_from_volume", {"filenames": [str(source)]}, tool_context
+    )
+    # With the local copies gone, only code that touches the documents can fail.
+    os.remove(tool_context.last_read_from_volume["local_path"])
+    for entry in tool_context.last_read_many_from_volume.values():
+        os.remove(entry["local_path"])
+
+    output = tools.handle_tool_call(
+        skill_config, "execute_python", {"code": "result = source_doc_filename"}, tool_context
+    )
+    assert output.endswith(f"Result:\n{source}")
+    for name in ["source_doc_bytes", "source_doc_base64", "source_docs"]:
+        output = tools.handle_tool_call(
+            skill_config, "execute_python", {"code": f"result = {name}"}, tool_context
+        )
+        assert output.startswith("Code execution failed:")
+
+
+# -----------------------------------------------------------------------------
+# execute_python -> save_to_volume
+# -----------------------------------------------------------------------------
+
+@pytest.mark.parametrize("payload", [b"\x00\xffdata", b""])
+def test_bytes_results_stay_out_of_the_tool_context(skill_config, tmp_path, payload):
+    tool_context = tools.ToolContext()
+    tool_context.run_directory = str(tmp_path)
+
+    output = tools.handle_tool_call(
+        skill_config, "execute_python", {"code": f"result = {payload!r}"}, tool_context
+    )
+    assert f"Result: <{len(payload)} bytes>. Use save_to_volume to save." in output
+    assert not any(
+        isinstance(value, bytes) for value in tool_context.to_dict()["last_execute_result"].values()
+    )
+
+    output = tools.handle_tool_call(skill_config, "save_to_volume", {"filename": "out.bin"}, tool_context)
+    assert output.startswith("File saved: ")
+    assert (Path(skill_config.session_output_path) / "out.bin").read_bytes() == payload
+    assert tool_context.last_execute_result == {}
+
+
+def test_base64_text_results_are_saved_decoded(skill_config, tmp_path):
+    tool_context = tools.ToolContext()
+    tool_context.run_directory = str(tmp_path)
+    encoded = base64.b64encode(b"hello").decode("ascii")
+    tools.handle_tool_call(
+        skill_config, "execute_python", {"code": f"result = {encoded!r}"}, tool_context
+    )
+
+    output = tools.handle_tool_call(skill_config, "save_to_volume", {"filename": "out.txt"}, tool_context)
+    assert output.startswith("File saved: ")
+    assert (Path(skill_config.session_output_path) / "out.txt").read_bytes() == b"hello"
+
+
+# -----------------------------------------------------------------------------
+# read_many_from_volume
+# -----------------------------------------------------------------------------
+
+def test_read_many_from_uc_volume_dedupes_and_keeps_request_order(skill_config, tmp_path):
+    session_dir = Path(skill_config.session_output_path)
+    session_dir.mkdir(parents=True)
+    (session_dir / "a.txt").write_bytes(b"A")
+    (session_dir / "b.txt").write_bytes(b"BB")
+    run_directory = tmp_path / "run"
+    run_directory.mkdir()
+
+    results = tools.read_many_from_uc_volume(
+        skill_config, ["b.txt", "missing.txt", "a.txt", "b.txt"], str(run_directory)
+    )
+
+    assert list(results) == ["b.txt", "missing.txt", "a.txt"]
+    assert results["missing.txt"] == {
+        "success": False, "error": "File not found: missing.txt", "path": None
+    }
+    for filename, content in [("a.txt", b"A"), ("b.txt", b"BB")]:
+        assert results[filename]["path"] == f"{session_dir}/{filename}"
+        assert results[filename]["size_bytes"] == len(content)
+        assert Path(results[filename]["local_path"]).read_bytes() == content
+    # Only the successful reads leave a copy behind.
+    assert len(os.listdir(run_directory)) == 2
+
+
+def test_read_many_from_volume_exposes_source_docs(skill_config, tmp_path):
+    session_dir = Path(skill_config.session_output_path)
+    session_dir.mkdir(parents=True)
+    (session_dir / "a.txt").write_bytes(b"A")
+    tool_context = tools.ToolContext()
+    tool_context.run_directory = str(tmp_path)
+
+    output = tools.handle_tool_call(
+        skill_config, "read_many_from_volume", {"filenames": ["a.txt", "missing.txt"]}, tool_context
+    )
+    assert output.splitlines() == [
+        "Read 1 of 2 file(s). Available in execute_python as source_docs[filename].",
+        "- a.txt: read (1 bytes)",
+        "- missing.txt: failed (File not found: missing.txt)",
+    ]
+
+    output = tools.handle_tool_call(
+        skill_config, "execute_python", {"code": "result = sorted(source_docs.items())"}, tool_context
+    )
+    assert output.endswith("Result:\n[('a.txt', b'A')]")
+
+
+def test_read_many_from_volume_replaces_the_previous_batch(skill_config, tmp_path):
+    session_dir = Path(skill_config.session_output_path)
+    session_dir.mkdir(parents=True)
+    (session_dir / "a.txt").write_bytes(b"A")
+    (session_dir / "b.txt").write_bytes(b"B")
+    tool_context = tools.ToolContext()
+    tool_context.run_directory = str(tmp_path / "run")
+    os.mkdir(tool_context.run_directory)
+
+    tools.handle_tool_call(skill_config, "read_many_from_volume", {"filenames": ["a.txt"]}, tool_context)
+    tools.handle_tool_call(skill_config, "read_many_from_volume", {"filenames": ["b.txt"]}, tool_context)
+
+    assert list(tool_context.last_read_many_from_volume) == ["b.txt"]
+    # The first batch's copy was discarded rather than left for the end of the run.
+    assert os.listdir(tool_context.run_directory) == [
+        os.path.basename(tool_context.last_read_many_from_volume["b.txt"]["local_path"])
+    ]
+
+
+@pytest.mark.parametrize("filenames", [[], "a.txt", None])
+def test_read_many_from_volume_needs_a_list_of_filenames(skill_config, filenames):
+    output = tools.handle_tool_call(skill_config, "read_many_from_volume", {"filenames": filenames})
+    assert output == "Failed to read: 'filenames' must be a non-empty list."
+
+
+# -----------------------------------------------------------------------------
+# copy_to_session
+# -----------------------------------------------------------------------------
+
+def test_copy_to_session_refuses_to_copy_a_file_onto_itself(skill_config):
+    session_dir = Path(skill_config.session_output_path)
+    session_dir.mkdir(parents=True)
+    (session_dir / "doc.txt").write_bytes(b"keep me")
+
+    result = tools.copy_file_to_current_session(skill_config, source_path=str(session_dir / "doc.txt"))
+
+    assert result["success"] is False
+    assert "are the same file" in result["error"]
+    assert (session_dir / "doc.txt").read_bytes() == b"keep me"
+
+
+def test_copy_to_session_copies_from_another_session(skill_config):
+    source_dir = Path(skill_config.local_output_dir) / "other"
+    source_dir.mkdir(parents=True)
+    (source_dir / "doc.txt").write_bytes(b"data")
+
+    result = tools.copy_file_to_current_session(
+        skill_config, source_session_id="other", filename="doc.txt", target_filename="copy.txt"
+    )
+
+    assert result["success"] is True
+    assert (Path(skill_config.session_output_path) / "copy.txt").read_bytes() == b"data"
+
+
+# -----------------------------------------------------------------------------
+# list_volume_files
+# -----------------------------------------------------------------------------
+
+def test_list_volume_files_skips_unreadable_directories(skill_config, monkeypatch):
+    session_dir = Path(skill_config.session_output_path)
+    (session_dir / "locked").mkdir(parents=True)
+    (session_dir / "open").mkdir()
+    (session_dir / "top.txt").write_bytes(b"1")
+    (session_dir / "locked" / "hidden.txt").write_bytes(b"22")
+    (session_dir / "open" / "nested.txt").write_bytes(b"333")
+
+    scandir = os.scandir
+
+    def scandir_denying_locked(path):
+        # chmod does not stop root, so simulate the permission error.
+        if os.path.basename(path) == "locked":
+            raise PermissionError(13, "Permission denied", path)
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", scandir_denying_locked)
+    result = tools.list_uc_volume_files(skill_config)
+
+    assert result["success"] is True
+    assert sorted((f["name"], f["size_bytes"]) for f in result["files"]) == [
+        ("nested.txt", 3), ("top.txt", 1)
+    ]